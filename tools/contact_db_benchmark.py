@@ -0,0 +1,284 @@
+# contact_db_benchmark.py
+"""Contact book database benchmarks.
+
+Builds a contacts.db with --rows synthetic contacts and runs a workload
+against it with each connection layer:
+
+    single   one shared connection, default journal, a commit per write
+             (the contact book before the Database connection manager)
+    pooled   database.Database: WAL, tuned pragmas, reader pool, one writer,
+             but a commit per write (batch_max_ops=1)
+    grouped  database.Database as the app uses it: writes queued while the
+             previous batch commits share one commit
+
+Workloads:
+    mixed   --readers threads searching and paging the list while
+            --writers threads add and edit contacts
+    phone   searches for parts of phone numbers ("0917 55"), timed as a
+            LIKE '%...%' scan and through the contacts_phone trigram index
+
+Usage:
+    python tools/contact_db_benchmark.py
+    python tools/contact_db_benchmark.py --workload phone --rows 1000000
+    python tools/contact_db_benchmark.py --rows 200000 --seconds 10 --readers 8 --writers 2
+    python tools/contact_db_benchmark.py --readers 1 --writers 8 --layers pooled grouped
+"""
+
+import argparse
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from contextlib import contextmanager
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "week4_labs" / "contact_book_app" / "src"))
+
+import database  # noqa: E402
+
+# Digits per phone search in the phone workload
+PHONE_FRAGMENT_DIGITS = (3, 4, 5, 7)
+
+FIRST_NAMES = ["Juan", "Maria", "Jose", "Ana", "Pedro", "Luz", "Mark", "Grace", "John", "Rosa", "Carlo", "Bea"]
+LAST_NAMES = ["Santos", "Reyes", "Cruz", "Bautista", "Garcia", "Mendoza", "Torres", "Flores", "Ramos", "Aquino"]
+
+
+# ------------------------- Data -------------------------
+def fake_contact(rnd: random.Random, i: int):
+    first, last = rnd.choice(FIRST_NAMES), rnd.choice(LAST_NAMES)
+    name = f"{first} {last} {rnd.randrange(1000)}"
+    phone = f"09{rnd.randrange(10 ** 9):09d}"
+    email = f"{first.lower()}.{last.lower()}{i}@example.com"
+    return name, phone, email
+
+
+def build_seed(path: Path, rows: int, seed: int = 1):
+    """Creates a contacts.db with the current schema and `rows` contacts."""
+    rnd = random.Random(seed)
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE contacts (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, phone TEXT, email TEXT)"
+    )
+    conn.executemany(
+        "INSERT INTO contacts (name, phone, email) VALUES (?, ?, ?)",
+        (fake_contact(rnd, i) for i in range(rows)),
+    )
+    conn.commit()
+    database.migrate(conn)
+    conn.close()
+
+
+# ------------------------- Connection layers -------------------------
+class SingleConnection:
+    """The previous layer: one connection shared by every thread."""
+
+    def __init__(self, filename):
+        self.conn = sqlite3.connect(filename, check_same_thread=False)
+
+    @contextmanager
+    def reader(self):
+        yield self.conn
+
+    @contextmanager
+    def writer(self):
+        yield self.conn
+        self.conn.commit()
+
+    def write(self, operation, *args) -> Future:
+        future = Future()
+        with self.writer() as conn:
+            future.set_result(operation(conn, *args))
+        return future
+
+    def close(self):
+        self.conn.close()
+
+
+LAYERS = {
+    "single": SingleConnection,
+    "pooled": lambda filename: database.Database(filename, batch_max_ops=1),
+    "grouped": database.Database,
+}
+
+
+# ------------------------- Workloads -------------------------
+def run_mixed(db, seconds: float, readers: int, writers: int, rows: int) -> dict:
+    """Readers search and page while writers add and edit, for `seconds`."""
+    latencies = {"read": [], "write": []}
+    errors = Counter()
+    lock = threading.Lock()
+    stop = time.perf_counter() + seconds
+
+    def reader(worker: int):
+        rnd = random.Random(100 + worker)
+        local, failed = [], Counter()
+        while time.perf_counter() < stop:
+            started = time.perf_counter()
+            try:
+                if rnd.random() < 0.5:
+                    term = rnd.choice(FIRST_NAMES)[: rnd.randint(2, 4)] + " " + rnd.choice(LAST_NAMES)[:2]
+                    database.search_contacts_page(db, term)
+                else:
+                    after = (rnd.choice(FIRST_NAMES), rnd.randrange(rows))
+                    database.get_contacts_page(db, after)
+            except Exception as exc:
+                failed[type(exc).__name__ + ": " + str(exc)[:60]] += 1
+                continue
+            local.append(time.perf_counter() - started)
+        with lock:
+            latencies["read"].extend(local)
+            errors.update(failed)
+
+    def writer(worker: int):
+        rnd = random.Random(200 + worker)
+        local, failed = [], Counter()
+        while time.perf_counter() < stop:
+            started = time.perf_counter()
+            try:
+                if rnd.random() < 0.5:
+                    database.add_contact_db(db, *fake_contact(rnd, rows + worker))
+                else:
+                    database.update_contact_db(db, rnd.randrange(1, rows), *fake_contact(rnd, worker))
+            except Exception as exc:
+                failed[type(exc).__name__ + ": " + str(exc)[:60]] += 1
+                continue
+            local.append(time.perf_counter() - started)
+        with lock:
+            latencies["write"].extend(local)
+            errors.update(failed)
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads += [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(latencies, errors, seconds)
+
+
+def phone_fragment(rnd: random.Random, phone: str, digits: int) -> str:
+    """A piece of phone as a user would type it, split by a space: "0917 55"."""
+    start = rnd.randrange(len(phone) - digits + 1)
+    fragment = phone[start:start + digits]
+    split = rnd.randint(1, digits - 1)
+    return fragment[:split] + " " + fragment[split:]
+
+
+def run_phone(db, queries: int, rows: int) -> list:
+    """Times each phone search as a LIKE scan and through the trigram index."""
+    rnd = random.Random(300)
+    scan_sql = (
+        "SELECT id, name, phone, email FROM contacts WHERE replace(phone, ' ', '') LIKE ?"
+        " ORDER BY name COLLATE NOCASE, id"
+    )
+    results = []
+    for digits in PHONE_FRAGMENT_DIGITS:
+        latencies = {"scan": [], "index": []}
+        matches = 0
+        for _ in range(queries):
+            with db.reader() as conn:
+                (phone,) = conn.execute("SELECT phone FROM contacts WHERE id = ?", (rnd.randrange(1, rows + 1),)).fetchone()
+            term = phone_fragment(rnd, phone, digits)
+
+            started = time.perf_counter()
+            with db.reader() as conn:
+                expected = conn.execute(scan_sql, (f"%{term.replace(' ', '')}%",)).fetchall()
+            latencies["scan"].append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            found = database.get_all_contacts_db(db, term)
+            latencies["index"].append(time.perf_counter() - started)
+
+            if {row[0] for row in expected} - {row[0] for row in found}:
+                raise AssertionError(f"index search for {term!r} missed contacts the scan found")
+            matches += len(found)
+        results.append((digits, matches / queries, latencies))
+    return results
+
+
+def report_phone(results):
+    print(f"{'digits':>6s} {'matches':>9s} | {'scan p50':>9s} {'p95':>9s} | {'index p50':>9s} {'p95':>9s} | speedup")
+    for digits, matches, latencies in results:
+        scan, index = latencies["scan"], latencies["index"]
+        print(
+            f"{digits:6d} {matches:9.1f} | {1000 * statistics.median(scan):7.2f}ms {1000 * percentile(scan, 0.95):7.2f}ms"
+            f" | {1000 * statistics.median(index):7.2f}ms {1000 * percentile(index, 0.95):7.2f}ms"
+            f" | {statistics.median(scan) / statistics.median(index):6.1f}x"
+        )
+
+
+def percentile(values, fraction: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def summarize(latencies: dict, errors: Counter, seconds: float) -> dict:
+    result = {"errors": dict(errors)}
+    for kind, values in latencies.items():
+        result[f"{kind}s_per_s"] = round(len(values) / seconds, 1)
+        result[f"{kind}_p50_ms"] = round(1000 * statistics.median(values), 2) if values else 0.0
+        result[f"{kind}_p95_ms"] = round(1000 * percentile(values, 0.95), 2)
+    return result
+
+
+def report(layer: str, result: dict):
+    print(
+        f"{layer:8s} reads {result['reads_per_s']:9.1f}/s  p50 {result['read_p50_ms']:7.2f} ms  p95 {result['read_p95_ms']:7.2f} ms"
+        f" | writes {result['writes_per_s']:8.1f}/s  p50 {result['write_p50_ms']:7.2f} ms  p95 {result['write_p95_ms']:7.2f} ms"
+    )
+    for error, count in result["errors"].items():
+        print(f"{'':8s} {count} x {error}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the contact book's database layer.")
+    parser.add_argument("--rows", type=int, default=100_000, help="contacts in the test database")
+    parser.add_argument("--seconds", type=float, default=5.0, help="duration of each run")
+    parser.add_argument("--readers", type=int, default=4, help="reading threads")
+    parser.add_argument("--writers", type=int, default=1, help="writing threads")
+    parser.add_argument("--workload", choices=["mixed", "phone"], default="mixed", help="what to measure")
+    parser.add_argument("--queries", type=int, default=20, help="phone searches per fragment length (phone workload)")
+    parser.add_argument("--layers", nargs="*", default=list(LAYERS), help=f"layers to run: {', '.join(LAYERS)}")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.layers if name not in LAYERS]
+    if unknown:
+        parser.error(f"unknown layer(s): {', '.join(unknown)}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        seed = Path(tmp) / "seed.db"
+        print(f"building {args.rows} contacts...", file=sys.stderr)
+        started = time.perf_counter()
+        build_seed(seed, args.rows)
+        print(f"built in {time.perf_counter() - started:.1f} s", file=sys.stderr)
+        if args.workload == "phone":
+            print(f"phone workload: {args.rows} contacts, {args.queries} searches per length")
+            db = database.Database(str(seed))
+            try:
+                report_phone(run_phone(db, args.queries, args.rows))
+            finally:
+                db.close()
+            return 0
+        print(f"mixed workload: {args.readers} readers, {args.writers} writers, {args.seconds:g} s")
+        for name in args.layers:
+            path = Path(tmp) / f"{name}.db"
+            shutil.copy(seed, path)
+            db = LAYERS[name](str(path))
+            try:
+                report(name, run_mixed(db, args.seconds, args.readers, args.writers, args.rows))
+            finally:
+                db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
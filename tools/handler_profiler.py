@@ -0,0 +1,286 @@
+# handler_profiler.py
+"""Opt-in timing and cProfile sampling for Flet event handlers.
+
+Every app in this repository installs it from main(page) when FLET_PROFILE=1
+is set, so it also works under `flet run` and in `flet build` packages
+(copy this file next to the app's main.py for a package):
+
+    set FLET_PROFILE=1
+    flet run weather_app
+
+Every on_click / on_change / on_submit handler is wrapped when it is
+assigned to a control, so later controls (dialogs, contact cards) are
+covered without rescanning the page. As a shortcut, this script can also
+launch an app with profiling on:
+
+    python tools/handler_profiler.py week4_labs/contact_book_app/src/main.py
+
+Every call is timed. When a handler takes longer than the threshold, its
+next calls are run under cProfile; samples that are slow again are added
+to profiles/<handler>.pstats (open with snakeviz, or turn into a flame
+graph with flameprof / gprof2dot). profiles/summary.json holds call
+counts and timings for every handler and is rewritten as the app runs.
+
+Settings (environment variables):
+    FLET_PROFILE               1 to turn profiling on inside the apps
+    FLET_PROFILE_THRESHOLD_MS  slow-handler threshold (default 100)
+    FLET_PROFILE_SAMPLES       profiled samples kept per handler (default 5)
+    FLET_PROFILE_DIR           output directory (default ./profiles)
+"""
+
+import atexit
+import cProfile
+import functools
+import inspect
+import json
+import os
+import pstats
+import re
+import runpy
+import sys
+import threading
+import time
+from pathlib import Path
+
+import flet as ft
+
+EVENTS = ("on_click", "on_change", "on_submit")
+
+
+class HandlerProfiler:
+    """Wraps handlers found on a page and records how long they take."""
+
+    def __init__(self, threshold_ms: float = 100, samples: int = 5, out_dir: str = "profiles"):
+        self.threshold = threshold_ms / 1000
+        self.samples = samples
+        self.out_dir = Path(out_dir)
+        self.stats = {}  # handler name -> {"calls", "total", "max", "slow", "sampled"}
+        self._wants_sample = set()
+        self._summary_written = 0.0
+        self._lock = threading.Lock()
+        self._profiling = threading.Lock()  # cProfile can profile one call at a time
+
+    # ------------------------- Installing -------------------------
+    def install(self, page=None):
+        """
+        Wraps handlers from now on, as they are assigned to any control, and
+        the ones already on `page`. Patches the on_* properties of the Flet
+        control classes, so it costs nothing per page update.
+        """
+        for cls in control_classes():
+            for event in EVENTS:
+                prop = cls.__dict__.get(event)
+                if isinstance(prop, property) and prop.fset is not None and not getattr(prop.fset, "__profiled__", False):
+                    setattr(cls, event, self._hooked(prop, event))
+        if page is not None:
+            self.wrap_tree(page)
+
+    def _hooked(self, prop, event: str):
+        def fset(control, handler):
+            if callable(handler) and not getattr(handler, "__profiled__", False):
+                handler = self.wrap(control, event, handler)
+            prop.fset(control, handler)
+
+        fset.__profiled__ = True
+        return property(prop.fget, fset, prop.fdel, prop.__doc__)
+
+    def wrap_tree(self, page):
+        """Wraps handlers on controls that already exist (run once, at install)."""
+        roots = list(getattr(page, "controls", [])) + list(getattr(page, "overlay", []))
+        stack = [c for c in roots if c is not None]
+        seen = set()
+        while stack:
+            control = stack.pop()
+            if id(control) in seen:
+                continue
+            seen.add(id(control))
+            for event in EVENTS:
+                handler = getattr(control, event, None)
+                if callable(handler) and not getattr(handler, "__profiled__", False):
+                    setattr(control, event, self.wrap(control, event, handler))
+            try:
+                stack.extend(c for c in control._get_children() if c is not None)
+            except Exception:
+                pass
+
+    def wrap(self, control, event: str, handler):
+        names = []  # filled on the first call: labels are often set after the handler
+
+        def name():
+            if not names:
+                names.append(handler_name(control, event, handler))
+            return names[0]
+
+        if inspect.iscoroutinefunction(handler):
+
+            @functools.wraps(handler)
+            async def wrapped(e):
+                # cProfile would also record other tasks running during awaits,
+                # so async handlers are timed but not sampled.
+                started = time.perf_counter()
+                try:
+                    return await handler(e)
+                finally:
+                    self.record(name(), time.perf_counter() - started)
+
+        else:
+
+            @functools.wraps(handler)
+            def wrapped(e):
+                profiler = self._start_sample(name())
+                started = time.perf_counter()
+                try:
+                    return handler(e)
+                finally:
+                    elapsed = time.perf_counter() - started
+                    if profiler is not None:
+                        self._finish_sample(name(), profiler, elapsed)
+                    self.record(name(), elapsed)
+
+        wrapped.__profiled__ = True
+        return wrapped
+
+    # ------------------------- Recording -------------------------
+    def record(self, name: str, elapsed: float):
+        with self._lock:
+            entry = self.stats.setdefault(name, {"calls": 0, "total": 0.0, "max": 0.0, "slow": 0, "sampled": 0})
+            entry["calls"] += 1
+            entry["total"] += elapsed
+            entry["max"] = max(entry["max"], elapsed)
+            if elapsed > self.threshold:
+                entry["slow"] += 1
+                if entry["sampled"] < self.samples:
+                    self._wants_sample.add(name)
+            # keep file writes off the hot path: at most once a second
+            if time.monotonic() - self._summary_written > 1.0:
+                self._write_summary()
+
+    def _start_sample(self, name: str):
+        with self._lock:
+            if name not in self._wants_sample:
+                return None
+        if not self._profiling.acquire(blocking=False):
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # another profiler is active in this process
+            self._profiling.release()
+            return None
+        return profiler
+
+    def _finish_sample(self, name: str, profiler, elapsed: float):
+        try:
+            profiler.disable()
+        finally:
+            self._profiling.release()
+        if elapsed <= self.threshold:
+            return
+        with self._lock:
+            self._wants_sample.discard(name)
+            self.stats[name]["sampled"] += 1
+            self.out_dir.mkdir(parents=True, exist_ok=True)
+            path = self.out_dir / f"{safe_filename(name)}.pstats"
+            stats = pstats.Stats(profiler)
+            if path.exists():
+                stats.add(str(path))
+            stats.dump_stats(str(path))
+
+    def write_summary(self):
+        with self._lock:
+            self._write_summary()
+
+    def _write_summary(self):
+        self._summary_written = time.monotonic()
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        summary = {
+            name: {
+                "calls": s["calls"],
+                "avg_ms": round(1000 * s["total"] / s["calls"], 3),
+                "max_ms": round(1000 * s["max"], 3),
+                "slow_calls": s["slow"],
+                "profiled_samples": s["sampled"],
+            }
+            for name, s in sorted(self.stats.items())
+        }
+        tmp = self.out_dir / "summary.json.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        os.replace(tmp, self.out_dir / "summary.json")
+
+
+def handler_name(control, event: str, handler) -> str:
+    label = getattr(control, "text", None) or getattr(control, "label", None) or getattr(control, "tooltip", None)
+    func = getattr(handler, "__qualname__", type(handler).__name__)
+    code = getattr(handler, "__code__", None)
+    if "<lambda>" in func and code is not None:
+        # lambdas all share one name; where they are defined tells them apart
+        func = f"{func}@{Path(code.co_filename).name}:{code.co_firstlineno}"
+    parts = [type(control).__name__, event, func]
+    if isinstance(label, str) and label:
+        parts.insert(1, label)
+    return ".".join(parts)
+
+
+def safe_filename(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name)[:150]
+
+
+def control_classes():
+    """Every Flet control class loaded so far."""
+    classes, stack = [], [ft.Control]
+    while stack:
+        cls = stack.pop()
+        classes.append(cls)
+        stack.extend(cls.__subclasses__())
+    return classes
+
+
+def profiler_from_env() -> HandlerProfiler:
+    return HandlerProfiler(
+        threshold_ms=float(os.getenv("FLET_PROFILE_THRESHOLD_MS", "100")),
+        samples=int(os.getenv("FLET_PROFILE_SAMPLES", "5")),
+        out_dir=os.getenv("FLET_PROFILE_DIR", "profiles"),
+    )
+
+
+_shared_profiler = None
+_shared_lock = threading.Lock()
+
+
+def install_from_env(page) -> HandlerProfiler:
+    """
+    Installs one process-wide profiler (configured from the environment) on
+    page. Apps call this from main(page) when FLET_PROFILE=1.
+    """
+    global _shared_profiler
+    with _shared_lock:
+        if _shared_profiler is None:
+            _shared_profiler = profiler_from_env()
+            atexit.register(_shared_profiler.write_summary)
+        profiler = _shared_profiler
+    profiler.install(page)
+    return profiler
+
+
+def run_app(script: str):
+    """Runs an app script with FLET_PROFILE=1, so its main(page) installs the profiler."""
+    os.environ["FLET_PROFILE"] = "1"
+    script_path = Path(script).resolve()
+    sys.path.insert(0, str(script_path.parent))
+    sys.argv = [str(script_path)]
+    runpy.run_path(str(script_path), run_name="__main__")
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print(__doc__, file=sys.stderr)
+        return 2
+    run_app(argv[0])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+# leak_profiler.py
+"""Control-tree growth and memory profiling over repeated interactions.
+
+Repeats an interaction N times on the headless page harness, taking a
+tracemalloc snapshot and a control count after a warm-up round and again
+at the end. Reports:
+
+- controls on the page and live ft.Control objects, by type
+- the call sites whose allocations grew the most
+
+Usage:
+    python tools/leak_profiler.py                  # profile every scenario, 50 rounds
+    python tools/leak_profiler.py weather.search -n 200
+    python tools/leak_profiler.py --check          # exit 1 if a control count grows
+
+With --check, page controls may not grow at all between rounds and live
+controls may grow by at most --slack (objects waiting for garbage
+collection, caches).
+"""
+
+import argparse
+import gc
+import sys
+import tempfile
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from types import SimpleNamespace
+
+import flet as ft
+
+from page_harness import (
+    contact_book_harness,
+    iter_controls,
+    login_harness,
+    weather_harness,
+    weather_search,
+)
+
+
+def live_controls() -> Counter:
+    """Count every ft.Control still alive in the process, by type."""
+    gc.collect()
+    return Counter(type(obj).__name__ for obj in gc.get_objects() if isinstance(obj, ft.Control))
+
+
+def page_controls(harness) -> Counter:
+    return Counter(type(c).__name__ for c in iter_controls(harness.page.roots()))
+
+
+def profile(harness, interact, rounds: int, top: int = 10, warmup: int = 1) -> dict:
+    """Run `interact(i)` `rounds` times and compare before/after state."""
+    for i in range(warmup):
+        interact(i)  # warm-up: first-use allocations are not leaks
+    tracemalloc.start(25)
+    page_before, live_before = page_controls(harness), live_controls()
+    snapshot_before = tracemalloc.take_snapshot()
+
+    for i in range(warmup, warmup + rounds):
+        interact(i)
+
+    snapshot_after = tracemalloc.take_snapshot()
+    page_after, live_after = page_controls(harness), live_controls()
+    tracemalloc.stop()
+
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+    stats = snapshot_after.filter_traces(filters).compare_to(snapshot_before.filter_traces(filters), "lineno")
+    return {
+        "rounds": rounds,
+        "page_growth": dict((page_after - page_before).most_common()),
+        "page_total": sum(page_after.values()),
+        "live_growth": dict((live_after - live_before).most_common()),
+        "top_allocations": [
+            (str(stat.traceback[0]), stat.size_diff, stat.count_diff)
+            for stat in stats[:top]
+            if stat.size_diff > 0
+        ],
+    }
+
+
+def scenario_weather_search(tmp: Path, rounds: int) -> dict:
+    harness = weather_harness(tmp)
+    cities = ["London", "Tokyo", "Manila", "Paris"]
+    try:
+        return profile(harness, lambda i: weather_search(harness, cities[i % len(cities)]), rounds)
+    finally:
+        harness.close()
+
+
+def scenario_login(tmp: Path, rounds: int) -> dict:
+    import mysql.connector
+
+    # each round takes the next outcome: empty fields, success, wrong password, database down
+    outcomes = [None, True, False, mysql.connector.Error("harness: database unavailable")]
+    current = [None]
+
+    def check_credentials(username, password):
+        if isinstance(current[0], Exception):
+            raise current[0]
+        return current[0]
+
+    harness = login_harness(check_credentials)
+    username = harness.find(ft.TextField, label="User name")
+    password = harness.find(ft.TextField, label="Password")
+    login_button = harness.find(ft.ElevatedButton, text="Login")
+
+    def interact(i):
+        current[0] = outcomes[i % len(outcomes)]
+        filled = current[0] is not None
+        username.value = "juan" if filled else ""
+        password.value = "secret" if filled else ""
+        harness.fire(login_button)
+        # dismiss the dialog the click opened, as a user would
+        for dialog in [c for c in harness.page.overlay if isinstance(c, ft.AlertDialog) and c.open]:
+            harness.fire(dialog.actions[0])
+
+    try:
+        # one warm-up round per outcome, so each dialog has been opened once
+        return profile(harness, interact, rounds, warmup=len(outcomes))
+    finally:
+        harness.close()
+
+
+CONTACT_FIRST_NAMES = ["Maria", "Mark", "Juan", "Jose", "Ana", "Andres", "Carlos", "Liza"]
+CONTACT_LAST_NAMES = ["Santos", "Reyes", "Cruz", "Bautista", "Garcia", "Mendoza"]
+
+# prefixes matching many, few and no contacts, and "" for the whole list
+CONTACT_SEARCHES = ["Ma", "Maria", "Jo", "", "Andres Cruz", "zz", "An", "Mendoza"]
+
+
+def scenario_contacts(tmp: Path, rounds: int) -> dict:
+    contacts = [
+        (f"{first} {last} {n}", f"0917{n:07d}", f"contact{n}@example.com")
+        for n, (first, last) in enumerate(
+            (first, last) for _ in range(10) for first in CONTACT_FIRST_NAMES for last in CONTACT_LAST_NAMES
+        )
+    ]
+    harness = contact_book_harness(tmp, contacts)
+    search = harness.find(ft.TextField, label="Search contacts")
+    view = harness.find(ft.ListView)
+    row_height = sys.modules["contact_list"].ROW_HEIGHT
+
+    def scroll(pixels):
+        harness.call(view.on_scroll, SimpleNamespace(control=view, pixels=pixels, viewport_dimension=600))
+
+    def interact(i):
+        # searches of different sizes create, recycle and drop cards; the
+        # scroll moves the card window down a long result and back
+        search.value = CONTACT_SEARCHES[i % len(CONTACT_SEARCHES)]
+        harness.fire(search, "on_change")
+        scroll(row_height * 60)
+        scroll(0)
+
+    try:
+        return profile(harness, interact, rounds, warmup=len(CONTACT_SEARCHES))
+    finally:
+        harness.close()
+
+
+SCENARIOS = {
+    "weather.search": scenario_weather_search,
+    "login.click": scenario_login,
+    "contacts.search": scenario_contacts,
+}
+
+
+def report(name: str, result: dict):
+    print(f"== {name} ({result['rounds']} rounds, {result['page_total']} controls on page)")
+    print(f"   page control growth: {result['page_growth'] or 'none'}")
+    print(f"   live control growth: {result['live_growth'] or 'none'}")
+    for site, size, count in result["top_allocations"]:
+        print(f"   {size / 1024:9.1f} KiB {count:+7d} blocks  {site}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Find control and memory growth across repeated interactions.")
+    parser.add_argument("scenarios", nargs="*", help=f"scenarios to run: {', '.join(SCENARIOS)} (default: all)")
+    parser.add_argument("-n", "--rounds", type=int, default=50, help="interactions per scenario")
+    parser.add_argument("--check", action="store_true", help="fail if control counts grow")
+    parser.add_argument("--slack", type=int, default=5, help="allowed growth of live controls with --check")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in args.scenarios or list(SCENARIOS):
+            result = SCENARIOS[name](Path(tmp), args.rounds)
+            report(name, result)
+            if result["page_growth"]:
+                failures.append(f"{name}: page gained controls {result['page_growth']}")
+            if sum(result["live_growth"].values()) > args.slack:
+                failures.append(f"{name}: {sum(result['live_growth'].values())} live controls retained")
+
+    if args.check:
+        for failure in failures:
+            print(f"FAIL {failure}", file=sys.stderr)
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,522 @@
+# page_harness.py
+"""Headless Flet page harness for UI performance checks.
+
+Runs the apps in this repository against a recording stand-in for
+``ft.Page`` and drives their event handlers without a Flet client. For
+every interaction it records:
+
+- updates:    number of page.update() calls
+- diff_bytes: size of the changed control attributes sent by those updates
+- tree_size:  number of controls on the page afterwards
+- seconds:    wall time of the handler, including the tasks it started
+
+Usage:
+    python tools/page_harness.py                 # print measurements
+    python tools/page_harness.py --record        # save them as the budget
+    python tools/page_harness.py --check         # fail if heavier than the budget
+
+Budgets live in tools/ui_budgets.json. Updates may not exceed the budget;
+diff_bytes and tree_size may grow by at most --tolerance (default 10%).
+Time is reported but only checked with --max-time-ratio, because it is
+noisy on shared CI machines.
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import inspect
+import itertools
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import flet as ft
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BUDGETS_FILE = Path(__file__).resolve().parent / "ui_budgets.json"
+
+
+# ------------------------- Recording page -------------------------
+class FakeWindow(SimpleNamespace):
+    """Accepts any window setting the apps make."""
+
+    def center(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeClientStorage:
+    def __init__(self):
+        self._data = {}
+
+    def get(self, key):
+        return self._data.get(key)
+
+    def set(self, key, value):
+        self._data[key] = value
+        return True
+
+    def contains_key(self, key):
+        return key in self._data
+
+    def remove(self, key):
+        self._data.pop(key, None)
+
+
+class RecordingPage:
+    """Stand-in for ``ft.Page`` that counts updates and sizes their diffs."""
+
+    def __init__(self, web: bool = False):
+        self.controls = []
+        self.overlay = []
+        self.dialog = None
+        self.window = FakeWindow()
+        self.client_storage = FakeClientStorage()
+        self.web = web
+        self.session_id = "harness"
+        self.loop = None
+        self.update_count = 0
+        self.diff_bytes = 0
+        self._snapshot = {}
+
+    # Legacy window helpers used by some labs
+    def window_center(self):
+        pass
+
+    def add(self, *controls):
+        self.controls.extend(controls)
+        self.update()
+
+    def update(self, *controls):
+        self.update_count += 1
+        self.diff_bytes += self._diff()
+
+    def open(self, control):
+        if control not in self.overlay:
+            self.overlay.append(control)
+        control.open = True
+        self.update()
+
+    def close(self, control):
+        control.open = False
+        self.update()
+
+    def run_task(self, handler, *args, **kwargs):
+        return asyncio.run_coroutine_threadsafe(handler(*args, **kwargs), self.loop)
+
+    def roots(self):
+        roots = list(self.controls) + list(self.overlay)
+        if self.dialog is not None:
+            roots.append(self.dialog)
+        return roots
+
+    def _diff(self) -> int:
+        """Bytes of control attributes changed since the last update."""
+        current = {}
+        size = 0
+        for control in iter_controls(self.roots()):
+            state = control_state(control)
+            key = id(control)
+            current[key] = state
+            previous = self._snapshot.get(key)
+            if previous is None:
+                changed = state
+                size += len(type(control).__name__)
+            else:
+                changed = {k: v for k, v in state.items() if previous.get(k) != v}
+            if changed:
+                size += len(json.dumps(changed, default=str, ensure_ascii=False))
+        # removed controls are sent as ids
+        size += 16 * len(self._snapshot.keys() - current.keys())
+        self._snapshot = current
+        return size
+
+
+def children_of(control):
+    get_children = getattr(control, "_get_children", None)
+    if callable(get_children):
+        try:
+            return [c for c in get_children() if c is not None]
+        except Exception:
+            pass
+    children = []
+    for name in ("controls", "actions", "items"):
+        value = getattr(control, name, None)
+        if isinstance(value, list):
+            children.extend(value)
+    for name in ("content", "title"):
+        value = getattr(control, name, None)
+        if isinstance(value, ft.Control):
+            children.append(value)
+    return children
+
+
+def iter_controls(roots):
+    """Yield every control reachable from `roots` once."""
+    stack = list(roots)
+    seen = set()
+    while stack:
+        control = stack.pop()
+        if control is None or id(control) in seen:
+            continue
+        seen.add(id(control))
+        yield control
+        stack.extend(children_of(control))
+
+
+def control_state(control) -> dict:
+    """The attributes Flet would serialize for a control."""
+    attrs = getattr(control, "_Control__attrs", None)
+    if isinstance(attrs, dict):
+        return {k: (v[0] if isinstance(v, tuple) else v) for k, v in attrs.items()}
+    return {
+        k: v
+        for k, v in vars(control).items()
+        if not k.startswith("_") and isinstance(v, (str, int, float, bool, type(None)))
+    }
+
+
+# ------------------------- Driving handlers -------------------------
+class Harness:
+    """Runs an app's main() on a RecordingPage and fires its handlers."""
+
+    def __init__(self, web: bool = False, settle: float = 0.3):
+        self.page = RecordingPage(web=web)
+        self.loop = asyncio.new_event_loop()
+        self.page.loop = self.loop
+        self.settle = settle
+
+    def close(self):
+        pending = [t for t in asyncio.all_tasks(self.loop) if not t.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        self.loop.close()
+
+    def start(self, main):
+        """Run the app's entry point like ft.app() would."""
+        self.call(main, self.page)
+
+    def call(self, func, *args, settle: bool = True):
+        """Call a sync or async handler the way Flet does, then let it settle.
+
+        Async handlers run on the event loop; sync handlers run on a worker
+        thread while the loop keeps running, as in a real Flet session.
+        With settle=False the tasks the handler started are left pending,
+        like events that arrive faster than the app handles them.
+        """
+
+        async def invoke():
+            if inspect.iscoroutinefunction(func):
+                await func(*args)
+            else:
+                result = await self.loop.run_in_executor(None, func, *args)
+                if inspect.isawaitable(result):
+                    await result
+            if settle:
+                await self._drain()
+
+        self.loop.run_until_complete(invoke())
+
+    async def _drain(self):
+        """Wait for tasks started by the handler (long-running loops excepted)."""
+        deadline = self.loop.time() + self.settle
+        current = asyncio.current_task()
+        while self.loop.time() < deadline:
+            pending = [t for t in asyncio.all_tasks() if t is not current and not t.done()]
+            if not pending:
+                break
+            await asyncio.wait(pending, timeout=0.05)
+        # let frame-coalesced updates flush
+        await asyncio.sleep(0.05)
+
+    def event(self, control=None, data=None):
+        return SimpleNamespace(control=control, data=data, page=self.page, name="", target="")
+
+    def fire(self, control, handler_name: str = "on_click", data=None, settle: bool = True):
+        handler = getattr(control, handler_name)
+        if handler is None:
+            raise ValueError(f"{type(control).__name__} has no {handler_name} handler")
+        self.call(handler, self.event(control, data), settle=settle)
+
+    def wait(self, seconds: float):
+        """Let `seconds` pass on the event loop, then let pending tasks settle."""
+
+        async def idle():
+            await asyncio.sleep(seconds)
+            await self._drain()
+
+        self.loop.run_until_complete(idle())
+
+    def find_all(self, control_type=None, **attrs):
+        return [
+            c
+            for c in iter_controls(self.page.roots())
+            if (control_type is None or isinstance(c, control_type))
+            and all(getattr(c, k, None) == v for k, v in attrs.items())
+        ]
+
+    def find(self, control_type=None, **attrs):
+        matches = self.find_all(control_type, **attrs)
+        if not matches:
+            raise LookupError(f"No {getattr(control_type, '__name__', 'control')} with {attrs}")
+        return matches[0]
+
+    def tree_size(self) -> int:
+        return sum(1 for _ in iter_controls(self.page.roots()))
+
+    def measure(self, action) -> dict:
+        """Run `action()` and return the cost of what it did to the page."""
+        updates, diff_bytes = self.page.update_count, self.page.diff_bytes
+        started = time.perf_counter()
+        action()
+        return {
+            "updates": self.page.update_count - updates,
+            "diff_bytes": self.page.diff_bytes - diff_bytes,
+            "tree_size": self.tree_size(),
+            "seconds": round(time.perf_counter() - started, 4),
+        }
+
+
+def load_app_module(app_dir: Path, module: str = "main"):
+    """Import an app's module under a unique name.
+
+    The apps use flat imports (``from database import ...``) and several
+    are called ``main.py``, so each app's sibling modules are re-imported
+    from its own directory.
+    """
+    app_dir = Path(app_dir)
+    for sibling in app_dir.glob("*.py"):
+        sys.modules.pop(sibling.stem, None)
+    sys.path.insert(0, str(app_dir))
+    try:
+        name = f"harness_{app_dir.parent.name}_{app_dir.name}_{module}"
+        spec = importlib.util.spec_from_file_location(name, app_dir / f"{module}.py")
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+        return mod
+    finally:
+        sys.path.remove(str(app_dir))
+
+
+# ------------------------- Scenarios -------------------------
+SAMPLE_WEATHER = {
+    "id": 2643743,
+    "name": "London",
+    "coord": {"lat": 51.51, "lon": -0.13},
+    "dt": 1700000000,
+    "sys": {"country": "GB"},
+    "main": {"temp": 12.3, "feels_like": 11.0, "humidity": 81},
+    "wind": {"speed": 4.1},
+    "weather": [{"description": "light rain", "icon": "10d"}],
+}
+
+SAMPLE_FORECAST = {
+    "lat": 51.51,
+    "lon": -0.13,
+    "hourly": [
+        {"dt": 1700000000 + 3600 * i, "temp": 10 + (i % 7), "pop": (i % 5) / 5, "wind_speed": 3 + i % 4}
+        for i in range(48)
+    ],
+}
+
+
+class FakeWeatherService:
+    """Offline WeatherService returning fixed payloads."""
+
+    def __init__(self):
+        self.locations = None
+
+    async def get_weather(self, city, refresh=False):
+        return dict(SAMPLE_WEATHER, name=city.title())
+
+    async def get_hourly_forecast(self, lat, lon):
+        return SAMPLE_FORECAST
+
+    async def get_weather_many(self, cities, concurrency=8):
+        for city in cities:
+            yield city, await self.get_weather(city), None
+
+
+def weather_harness(tmp: Path) -> Harness:
+    app = load_app_module(REPO_ROOT / "weather_app")
+    history_store = sys.modules["history_store"]
+    history_store.LOCAL_HISTORY_FILE = tmp / "search_history.json"
+    history_store.HISTORY_DIR = tmp / "history"
+    app.get_shared_service = FakeWeatherService
+    app.WeatherApp.speak_text = lambda self, text: None
+    harness = Harness()
+    harness.start(app.main)
+    return harness
+
+
+def weather_search(harness: Harness, city: str = "London"):
+    city_input = harness.find(ft.TextField, label="Enter city name")
+    city_input.value = city
+    harness.fire(city_input, "on_submit")
+
+
+def scenario_weather(tmp: Path) -> dict:
+    harness = weather_harness(tmp)
+    try:
+        results = {"weather.search": harness.measure(lambda: weather_search(harness))}
+        unit_button = harness.find(ft.ElevatedButton, text="°C")
+        results["weather.toggle_unit"] = harness.measure(lambda: harness.fire(unit_button))
+        return results
+    finally:
+        harness.close()
+
+
+def contact_book_harness(tmp: Path, contacts=()) -> Harness:
+    """Starts the contact book on a fresh database holding `contacts` (name, phone, email)."""
+    app_dir = REPO_ROOT / "week4_labs" / "contact_book_app" / "src"
+    app = load_app_module(app_dir)
+    database = sys.modules["database"]
+    database.DB_FILENAME = str(tmp / "contacts.db")
+    if contacts:
+        db = database.Database(database.DB_FILENAME)
+        with db.writer() as conn:
+            conn.executemany("INSERT INTO contacts (name, phone, email) VALUES (?, ?, ?)", contacts)
+        db.close()
+    harness = Harness()
+    harness.start(app.main)
+    return harness
+
+
+_contact_numbers = itertools.count(1)
+
+
+def add_contact(harness: Harness, name: str, phone: str = None, email: str = None):
+    # distinct phone/email by default, so the duplicate prompt does not open
+    number = next(_contact_numbers)
+    harness.find(ft.TextField, label="Name").value = name
+    harness.find(ft.TextField, label="Phone").value = phone or f"0917{number:07d}"
+    harness.find(ft.TextField, label="Email").value = email or f"contact{number}@example.com"
+    harness.fire(harness.find(ft.ElevatedButton, text="Add Contact"))
+
+
+def scenario_contact_book(tmp: Path) -> dict:
+    harness = contact_book_harness(tmp)
+    try:
+        for i in range(20):
+            add_contact(harness, f"Contact {i:02d}")
+        results = {"contacts.add": harness.measure(lambda: add_contact(harness, "Maria Clara"))}
+        search = harness.find(ft.TextField, label="Search contacts")
+
+        def type_search():
+            # keystrokes faster than the debounce, then one wait for it
+            for text in ("M", "Ma", "Mar"):
+                search.value = text
+                harness.fire(search, "on_change", settle=False)
+            harness.wait(sys.modules["contact_list"].SEARCH_DELAY)
+
+        # --check holds this to the recorded budget: one update, if the debounce works
+        results["contacts.search"] = harness.measure(type_search)
+        return results
+    finally:
+        harness.close()
+
+
+def login_harness(check_credentials=None) -> Harness:
+    """Starts the login lab; check_credentials replaces its MySQL lookup."""
+    app = load_app_module(REPO_ROOT / "week3_labs" / "src")
+    if check_credentials is not None:
+        app._check_credentials_sync = check_credentials
+    harness = Harness()
+    harness.start(app.main)
+    return harness
+
+
+def scenario_login(tmp: Path) -> dict:
+    harness = login_harness()
+    try:
+        login_button = harness.find(ft.ElevatedButton, text="Login")
+        # Empty fields take the input-error path, so no database is needed
+        return {"login.empty_click": harness.measure(lambda: harness.fire(login_button))}
+    finally:
+        harness.close()
+
+
+def scenario_personal_info(tmp: Path) -> dict:
+    app = load_app_module(REPO_ROOT, "personal_info_gui")
+    harness = Harness()
+    try:
+        harness.start(app.main)
+        harness.find(ft.TextField, label="First Name").value = "Juan"
+        harness.find(ft.TextField, label="Last Name").value = "Dela Cruz"
+        harness.find(ft.TextField, label="Age").value = "20"
+        generate = harness.find(ft.ElevatedButton, text="Generate Profile")
+        return {"profile.generate": harness.measure(lambda: harness.fire(generate))}
+    finally:
+        harness.close()
+
+
+SCENARIOS = [scenario_weather, scenario_contact_book, scenario_login, scenario_personal_info]
+
+
+def run_all() -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for scenario in SCENARIOS:
+            results.update(scenario(Path(tmp)))
+    return results
+
+
+def check(results: dict, budgets: dict, tolerance: float, max_time_ratio=None) -> list:
+    """Return a list of human-readable budget violations."""
+    failures = []
+    for name, budget in budgets.items():
+        got = results.get(name)
+        if got is None:
+            failures.append(f"{name}: scenario missing")
+            continue
+        if got["updates"] > budget["updates"]:
+            failures.append(f"{name}: {got['updates']} updates (budget {budget['updates']})")
+        for key in ("diff_bytes", "tree_size"):
+            limit = budget[key] * (1 + tolerance)
+            if got[key] > limit:
+                failures.append(f"{name}: {key} {got[key]} > {limit:.0f} (budget {budget[key]})")
+        if max_time_ratio and got["seconds"] > budget["seconds"] * max_time_ratio:
+            failures.append(f"{name}: {got['seconds']}s > {max_time_ratio}x budget {budget['seconds']}s")
+    return failures
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure UI cost of common interactions.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--record", action="store_true", help="write current measurements as the budget")
+    mode.add_argument("--check", action="store_true", help="fail if any interaction exceeds its budget")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed growth of bytes/tree size")
+    parser.add_argument("--max-time-ratio", type=float, help="also fail if a handler is this much slower")
+    args = parser.parse_args(argv)
+
+    results = run_all()
+    for name, values in results.items():
+        print(f"{name:24} " + "  ".join(f"{k}={v}" for k, v in values.items()))
+
+    if args.record:
+        with open(BUDGETS_FILE, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Budgets written to {BUDGETS_FILE}")
+    elif args.check:
+        if not BUDGETS_FILE.exists():
+            print("No budgets recorded yet; run with --record first.", file=sys.stderr)
+            return 2
+        with open(BUDGETS_FILE, "r", encoding="utf-8") as f:
+            budgets = json.load(f)
+        failures = check(results, budgets, args.tolerance, args.max_time_ratio)
+        for failure in failures:
+            print(f"FAIL {failure}", file=sys.stderr)
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
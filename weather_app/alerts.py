@@ -0,0 +1,195 @@
+# alerts.py
+"""Threshold alerts evaluated over many locations' hourly forecasts.
+
+Rules are short strings compiled once, for example:
+    wind > 15 within 12h
+    temp < 5
+    pop >= 0.8 within 6h
+
+Values are in the units set by Config.UNITS. Without a "within" clause a
+rule looks at the whole forecast.
+
+Usage:
+    python alerts.py rules.txt sites.txt
+
+sites.txt lists one "name,lat,lon" per line. Alerts are printed as JSONL
+whenever a rule starts or stops matching at a site.
+"""
+
+import argparse
+import asyncio
+import bisect
+import json
+import operator
+import re
+import sys
+import time
+from itertools import repeat
+from typing import Dict, List, Optional
+
+from config import Config
+from forecast import ForecastColumns
+from weather_service import WeatherService, WeatherServiceError
+
+# rule field -> key in the hourly forecast entries
+FIELDS = {
+    "temp": "temp",
+    "feels_like": "feels_like",
+    "humidity": "humidity",
+    "wind": "wind_speed",
+    "wind_speed": "wind_speed",
+    "gust": "wind_gust",
+    "pop": "pop",
+    "clouds": "clouds",
+}
+
+OPERATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+}
+
+RULE_PATTERN = re.compile(
+    r"^\s*(?P<field>\w+)\s*(?P<op>>=|<=|==|>|<)\s*(?P<value>-?\d+(?:\.\d+)?)\s*(?:[^\s\d]\S*)?"
+    r"\s*(?:(?:within|in)\s+(?:the\s+next\s+)?(?P<hours>\d+)\s*h)?\s*$",
+    re.IGNORECASE,
+)
+
+
+class AlertRule:
+    """A compiled threshold rule such as "wind > 15 within 12h"."""
+
+    def __init__(self, text: str):
+        match = RULE_PATTERN.match(text)
+        if not match:
+            raise ValueError(f"Cannot parse alert rule: {text!r}")
+        field = match.group("field").lower()
+        if field not in FIELDS:
+            raise ValueError(f"Unknown field {field!r} in rule {text!r}")
+        self.text = text.strip()
+        self.key = FIELDS[field]
+        self.compare = OPERATORS[match.group("op")]
+        self.threshold = float(match.group("value"))
+        hours = match.group("hours")
+        self.horizon = int(hours) * 3600 if hours else None
+
+    def first_match(self, columns: "ForecastColumns", now: float) -> Optional[int]:
+        """Index of the first forecast hour that matches, or None."""
+        values = columns.get(self.key)
+        if not values:
+            return None
+        end = len(values)
+        if self.horizon is not None:
+            end = bisect.bisect_right(columns.times, now + self.horizon)
+        hits = map(self.compare, values[:end], repeat(self.threshold))
+        return next((i for i, hit in enumerate(hits) if hit), None)
+
+    def __repr__(self):
+        return f"AlertRule({self.text!r})"
+
+
+class AlertEngine:
+    """Evaluates rules over many sites and reports only state changes."""
+
+    def __init__(self, service: WeatherService, rules: List[AlertRule], sites: List[tuple], on_change=None):
+        self.service = service
+        self.rules = rules
+        self.sites = sites  # (name, lat, lon)
+        self.on_change = on_change or (lambda alert: None)
+        self.active = {}  # (site name, rule text) -> bool
+
+    def evaluate(self, site: str, forecast: Dict, now: Optional[float] = None) -> List[Dict]:
+        """Evaluate every rule for one site; return alerts whose state changed."""
+        now = time.time() if now is None else now
+        columns = ForecastColumns(forecast)
+        changes = []
+        for rule in self.rules:
+            index = rule.first_match(columns, now)
+            matched = index is not None
+            key = (site, rule.text)
+            if self.active.get(key, False) == matched:
+                continue
+            self.active[key] = matched
+            alert = {"site": site, "rule": rule.text, "active": matched}
+            if matched:
+                alert["at"] = columns.times[index]
+                alert["value"] = columns.get(rule.key)[index]
+            changes.append(alert)
+            self.on_change(alert)
+        return changes
+
+    async def check_all(self, concurrency: int = 8) -> List[Dict]:
+        """Fetch every site's forecast concurrently and evaluate the rules."""
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def check(site):
+            name, lat, lon = site
+            async with semaphore:
+                try:
+                    forecast = await self.service.get_hourly_forecast(lat, lon)
+                except WeatherServiceError:
+                    # Keep the previous state when a forecast can't be fetched
+                    return []
+            return self.evaluate(name, forecast)
+
+        results = await asyncio.gather(*(check(site) for site in self.sites))
+        return [alert for changes in results for alert in changes]
+
+    async def run(self, interval: float = Config.OBSERVATION_INTERVAL):
+        """Check all sites on a schedule until cancelled."""
+        while True:
+            await self.check_all()
+            await asyncio.sleep(interval)
+
+
+def load_rules(path: str) -> List[AlertRule]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [AlertRule(line) for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+def load_sites(path: str) -> List[tuple]:
+    sites = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            name, lat, lon = (part.strip() for part in line.rsplit(",", 2))
+            sites.append((name, float(lat), float(lon)))
+    return sites
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Watch forecasts for threshold alerts.")
+    parser.add_argument("rules", help="file with one rule per line, e.g. 'wind > 15 within 12h'")
+    parser.add_argument("sites", help="file with one 'name,lat,lon' per line")
+    parser.add_argument("--once", action="store_true", help="check once and exit")
+    parser.add_argument("--interval", type=float, default=Config.OBSERVATION_INTERVAL, help="seconds between checks")
+    args = parser.parse_args(argv)
+
+    if not Config.API_KEY:
+        print("OPENWEATHER_API_KEY is not set.", file=sys.stderr)
+        return 2
+
+    def notify(alert):
+        print(json.dumps(alert, ensure_ascii=False), flush=True)
+
+    async def watch():
+        async with WeatherService() as service:
+            engine = AlertEngine(service, load_rules(args.rules), load_sites(args.sites), notify)
+            if args.once:
+                await engine.check_all()
+            else:
+                await engine.run(args.interval)
+
+    try:
+        asyncio.run(watch())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
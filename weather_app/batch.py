@@ -0,0 +1,142 @@
+# batch.py
+"""Headless batch weather lookups (no Flet, no audio) producing JSONL.
+
+Usage:
+    python batch.py cities.txt -o results.jsonl
+    cat cities.txt | python batch.py --concurrency 16
+
+Each input line is either a city name or "lat,lon". Blank lines and lines
+starting with '#' are skipped.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import Dict, Optional, Tuple
+
+from config import Config
+from weather_service import WeatherService, WeatherServiceError
+
+
+def parse_query(line: str):
+    """Return (lat, lon) for coordinate lines, otherwise the city name."""
+    parts = line.split(",")
+    if len(parts) == 2:
+        try:
+            return float(parts[0]), float(parts[1])
+        except ValueError:
+            pass
+    return line
+
+
+def normalize_weather(data: Dict) -> Dict:
+    """Flatten an OpenWeather current-weather payload into one record."""
+    main = data.get("main", {})
+    coord = data.get("coord", {})
+    weather = (data.get("weather") or [{}])[0]
+    return {
+        "name": data.get("name"),
+        "country": data.get("sys", {}).get("country"),
+        "lat": coord.get("lat"),
+        "lon": coord.get("lon"),
+        "dt": data.get("dt"),
+        "temp": main.get("temp"),
+        "feels_like": main.get("feels_like"),
+        "humidity": main.get("humidity"),
+        "wind_speed": data.get("wind", {}).get("speed"),
+        "description": weather.get("description"),
+        "units": Config.UNITS,
+    }
+
+
+async def fetch_one(service: WeatherService, line: str) -> Dict:
+    """Fetch one query and return a JSON-ready record (never raises)."""
+    query = parse_query(line)
+    try:
+        if isinstance(query, tuple):
+            data = await service.get_weather_by_coordinates(*query)
+        else:
+            data = await service.get_weather(query)
+        return {"query": line, "ok": True, **normalize_weather(data)}
+    except WeatherServiceError as e:
+        return {"query": line, "ok": False, "error": str(e)}
+
+
+async def run_batch(lines, out, concurrency: int = 8) -> Tuple[int, int, float]:
+    """Fetch every line with `concurrency` workers, streaming JSONL to `out`.
+
+    Input is consumed through a bounded queue so memory stays flat for
+    large inputs. Returns (total, failed, elapsed_seconds).
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 4)
+    total = 0
+    failed = 0
+    started = time.perf_counter()
+
+    async with WeatherService() as service:
+
+        async def worker():
+            nonlocal total, failed
+            while True:
+                line = await queue.get()
+                try:
+                    if line is None:
+                        return
+                    record = await fetch_one(service, line)
+                    total += 1
+                    if not record["ok"]:
+                        failed += 1
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                finally:
+                    queue.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(max(1, concurrency))]
+        try:
+            for raw in lines:
+                line = raw.strip()
+                if line and not line.startswith("#"):
+                    await queue.put(line)
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+            out.flush()
+
+    return total, failed, time.perf_counter() - started
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Fetch current weather for many cities as JSONL.")
+    parser.add_argument("input", nargs="?", help="file with one city or 'lat,lon' per line (default: stdin)")
+    parser.add_argument("-o", "--output", help="write JSONL here instead of stdout")
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="requests in flight (default: 8)")
+    args = parser.parse_args(argv)
+
+    if not Config.API_KEY:
+        print("OPENWEATHER_API_KEY is not set.", file=sys.stderr)
+        return 2
+
+    infile = open(args.input, "r", encoding="utf-8") if args.input else sys.stdin
+    outfile = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        total, failed, elapsed = asyncio.run(run_batch(infile, outfile, args.concurrency))
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+        if outfile is not sys.stdout:
+            outfile.close()
+
+    rate = total / elapsed if elapsed > 0 else 0.0
+    print(
+        f"{total} lookups ({total - failed} ok, {failed} failed) in {elapsed:.2f}s, {rate:.1f}/s",
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
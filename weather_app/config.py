@@ -1,31 +1,131 @@
 # config.py
 """Configuration management for the Weather App."""
 
+import asyncio
 import os
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
-
-class Config:
-    """Application configuration."""
-    
-    # API Configuration
-    API_KEY = os.getenv("OPENWEATHER_API_KEY", "")
-    BASE_URL = os.getenv(
-        "OPENWEATHER_BASE_URL", 
-        "https://api.openweathermap.org/data/2.5/weather"
-    )
-    
+import threading
+from pathlib import Path
+
+
+def find_env_file() -> Path:
+    """
+    The .env file read for settings not set in the real environment:
+    WEATHER_ENV_FILE if set, else the nearest .env in this module's folder
+    or a parent (where load_dotenv() used to look, so a .env at the repo
+    root still works), else the nearest one from the working directory up.
+    """
+    override = os.getenv("WEATHER_ENV_FILE")
+    if override:
+        return Path(override)
+    for start in (Path(__file__).resolve().parent, Path.cwd()):
+        for folder in (start, *start.parents):
+            if (folder / ".env").is_file():
+                return folder / ".env"
+    return Path(__file__).resolve().parent / ".env"
+
+
+def _flag(value: str) -> bool:
+    return value.lower() in ("1", "true", "yes")
+
+
+# Settings read from the environment / .env file:
+# name -> (environment variable, default, parser)
+ENV_SETTINGS = {
+    "API_KEY": ("OPENWEATHER_API_KEY", "", str),
+    "BASE_URL": ("OPENWEATHER_BASE_URL", "https://api.openweathermap.org/data/2.5/weather", str),
+    "TIMEOUT": ("OPENWEATHER_TIMEOUT", "10", float),  # seconds
+    "GROUP_BATCHING": ("WEATHER_GROUP_BATCHING", "", _flag),
+    "DASHBOARD_CITIES_FILE": ("WEATHER_DASHBOARD_CITIES", "dashboard_cities.txt", str),
+    "AUTO_REFRESH": ("WEATHER_AUTO_REFRESH", "", _flag),
+    "DEBUG": ("WEATHER_DEBUG", "", _flag),  # reports leaked or failed background tasks
+    "WATCH_ENV": ("WEATHER_WATCH_ENV", "", _flag),  # hot-reload .env changes
+    "PROFILE_HANDLERS": ("FLET_PROFILE", "", _flag),  # time event handlers (tools/handler_profiler.py)
+}
+
+
+class _LazyConfig(type):
+    """Resolves environment-backed settings on first access, not at import."""
+
+    def __getattr__(cls, name):
+        if name in ENV_SETTINGS:
+            return cls._resolve()[name]
+        raise AttributeError(f"type object 'Config' has no attribute {name!r}")
+
+
+class Config(metaclass=_LazyConfig):
+    """Application configuration.
+
+    API_KEY, BASE_URL, TIMEOUT and the other ENV_SETTINGS are read
+    from the environment (or the .env file) the first time one of them is
+    used, then cached. `Config.reload()` picks up edits to the .env file.
+    """
+
     # App Configuration
     APP_TITLE = "Weather App"
     APP_WIDTH = 400
     APP_HEIGHT = 600
-    
+
     # API Settings
-    UNITS = "metric"  # metric, imperial, or standard
-    TIMEOUT = 10  # seconds
-    
+    UNITS = "metric"  # fixed: the views convert to °F themselves
+    CACHE_TTL = 600  # seconds a response is reused (OpenWeather updates ~10 min)
+    RATE_LIMIT_PER_MINUTE = 60  # free-tier limit
+    GROUP_BATCH_WINDOW = 0.05  # seconds to collect lookups for one group request
+    NEARBY_RADIUS_KM = 2.0  # reuse an observation fetched this close to the requested point
+
+    # Dashboard Settings
+    DASHBOARD_CONCURRENCY = 8  # requests in flight
+    DASHBOARD_REFRESH_INTERVAL = 600  # seconds (OpenWeather updates ~10 min)
+
+    # Auto-refresh of the displayed city
+    OBSERVATION_INTERVAL = 600  # seconds between OpenWeather observations
+    AUTO_REFRESH_MIN = 120  # never refresh more often than this
+    AUTO_REFRESH_MAX = 3600  # upper bound after backing off
+
+    # Hot reload
+    WATCH_INTERVAL = 2.0  # seconds between .env modification checks
+
+    _values = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def _resolve(cls) -> dict:
+        values = cls._values
+        if values is None:
+            with cls._lock:
+                if cls._values is None:
+                    cls._values = cls._read()
+                values = cls._values
+        return values
+
+    @classmethod
+    def _read(cls) -> dict:
+        """Read every ENV_SETTINGS value; real environment variables win over .env."""
+        try:
+            from dotenv import dotenv_values
+            env_file = find_env_file()
+            file_values = dotenv_values(env_file) if env_file.exists() else {}
+        except ImportError:
+            file_values = {}
+
+        values = {}
+        for name, (variable, default, parse) in ENV_SETTINGS.items():
+            raw = os.environ.get(variable)
+            if raw is None:
+                raw = file_values.get(variable) or default
+            try:
+                values[name] = parse(raw)
+            except ValueError:
+                values[name] = parse(default)
+        return values
+
+    @classmethod
+    def reload(cls) -> set:
+        """Re-read the settings and return the names of those that changed."""
+        new = cls._read()
+        with cls._lock:
+            old, cls._values = cls._values or {}, new
+        return {name for name, value in new.items() if old.get(name) != value}
+
     @classmethod
     def validate(cls):
         """Validate that required configuration is present."""
@@ -36,8 +136,29 @@ class Config:
             )
         return True
 
+
+def _env_file_mtime():
+    try:
+        return find_env_file().stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+async def watch_env_file(on_change, interval: float = Config.WATCH_INTERVAL):
+    """Poll the .env file and call `on_change(changed_names)` after an edit."""
+    last = _env_file_mtime()
+    while True:
+        await asyncio.sleep(interval)
+        current = _env_file_mtime()
+        if current == last:
+            continue
+        last = current
+        changed = Config.reload()
+        if changed:
+            on_change(changed)
+
 # Validate configuration on import
 # Note: Do not validate on import to keep the app importable in dev/test
 # environments where an API key may not be present. Call `Config.validate()`
 # explicitly when you need to ensure the API key is available (e.g. before
-# making network requests).
\ No newline at end of file
+# making network requests).
@@ -0,0 +1,138 @@
+# dashboard.py
+"""Multi-city dashboard view for the Weather App."""
+
+import asyncio
+from pathlib import Path
+
+import flet as ft
+
+from config import Config
+
+
+def load_dashboard_cities(fallback=None):
+    """Read the dashboard city list (one city per line, '#' for comments).
+
+    Falls back to ``fallback`` (e.g. the search history) when the file is missing.
+    """
+    path = Path(Config.DASHBOARD_CITIES_FILE)
+    if not path.is_absolute():
+        path = Path(__file__).parent / path
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            lines = [line.strip() for line in f]
+        cities = [line for line in lines if line and not line.startswith("#")]
+    except OSError:
+        cities = list(fallback or [])
+
+    # drop duplicates (case-insensitive) while keeping order
+    seen = set()
+    unique = []
+    for city in cities:
+        if city.lower() not in seen:
+            seen.add(city.lower())
+            unique.append(city)
+    return unique
+
+
+class DashboardView:
+    """Grid of weather tiles, one per city, filled in as results arrive.
+
+    Tiles are created once as placeholders; fetches and scheduled refreshes
+    only change the texts of the affected tile. ``ft.GridView`` builds its
+    children lazily on the client, so only visible tiles are rendered.
+    """
+
+    def __init__(self, weather_service, updater, unit_getter):
+        self.weather_service = weather_service
+        self.updater = updater
+        self.unit_getter = unit_getter
+        self.cities = []
+        self.tiles = {}  # city -> (temp_text, desc_text)
+        self.last_data = {}  # city -> last weather payload
+
+        self.status = ft.Text("", size=12, color=ft.Colors.GREY_600)
+        self.grid = ft.GridView(
+            max_extent=170,
+            child_aspect_ratio=1.1,
+            spacing=10,
+            run_spacing=10,
+            height=Config.APP_HEIGHT - 180,
+        )
+        self.view = ft.Column([self.status, self.grid], visible=False, spacing=10)
+
+    def set_cities(self, cities):
+        """Create one placeholder tile per city."""
+        self.cities = list(cities)
+        self.tiles = {}
+        controls = []
+        for city in self.cities:
+            temp_text = ft.Text("…", size=24, weight=ft.FontWeight.BOLD, color=ft.Colors.BLUE_900)
+            desc_text = ft.Text("Loading", size=12, color=ft.Colors.GREY_600)
+            self.tiles[city] = (temp_text, desc_text)
+            controls.append(
+                ft.Container(
+                    content=ft.Column(
+                        [
+                            ft.Text(city, size=14, weight=ft.FontWeight.BOLD, no_wrap=True),
+                            temp_text,
+                            desc_text,
+                        ],
+                        horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                        alignment=ft.MainAxisAlignment.CENTER,
+                        spacing=4,
+                    ),
+                    bgcolor=ft.Colors.BLUE_50,
+                    border_radius=10,
+                    padding=10,
+                )
+            )
+        self.grid.controls = controls
+        self.updater.request_update()
+
+    def update_tile(self, city: str, data=None, error=None):
+        """Update one tile's texts in place."""
+        tile = self.tiles.get(city)
+        if tile is None:
+            return
+        temp_text, desc_text = tile
+        if error is not None:
+            # forget the old reading, so a unit change doesn't bring it back as current
+            self.last_data.pop(city, None)
+            temp_text.value = "–"
+            desc_text.value = str(error)
+        else:
+            self.last_data[city] = data
+            temp = data.get("main", {}).get("temp", 0)
+            if self.unit_getter() == "imperial":
+                temp_text.value = f"{(temp * 9/5 + 32):.1f}°F"
+            else:
+                temp_text.value = f"{temp:.1f}°C"
+            desc_text.value = data.get("weather", [{}])[0].get("description", "").title()
+        self.updater.request_update()
+
+    def refresh_units(self):
+        """Re-render temperatures after a unit change without refetching."""
+        for city, data in list(self.last_data.items()):
+            self.update_tile(city, data)
+
+    async def refresh(self):
+        """Fetch every city concurrently and fill tiles as results arrive."""
+        done = 0
+        failed = 0
+        self.status.value = f"Updating {len(self.cities)} cities…"
+        self.updater.request_update()
+        async for city, data, error in self.weather_service.get_weather_many(
+            self.cities, Config.DASHBOARD_CONCURRENCY
+        ):
+            done += 1
+            if error is not None:
+                failed += 1
+            self.update_tile(city, data, error)
+        self.status.value = f"{done - failed}/{done} cities updated"
+        self.updater.flush()
+
+    async def run(self):
+        """Refresh now and then on a fixed schedule until cancelled."""
+        while True:
+            await self.refresh()
+            await asyncio.sleep(Config.DASHBOARD_REFRESH_INTERVAL)
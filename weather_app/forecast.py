@@ -0,0 +1,35 @@
+# forecast.py
+"""Column access to hourly forecast payloads, shared by charts and alerts."""
+
+from typing import Dict, List
+
+
+class ForecastColumns:
+    """Hourly forecast entries turned into one list per field.
+
+    Columns are built once per forecast and shared by every alert rule
+    and chart that reads them.
+    """
+
+    def __init__(self, forecast: Dict):
+        hourly = forecast.get("hourly") or forecast.get("list") or []
+        self.times = [entry.get("dt", 0) for entry in hourly]
+        self._hourly = hourly
+        self._columns = {}
+
+    def get(self, key: str) -> List[float]:
+        column = self._columns.get(key)
+        if column is None:
+            column = [_number(entry, key) for entry in self._hourly]
+            self._columns[key] = column
+        return column
+
+
+def _number(entry: Dict, key: str) -> float:
+    # 3-hourly /forecast entries keep temperatures under "main" and wind under "wind"
+    value = entry.get(key)
+    if value is None:
+        value = entry.get("main", {}).get(key)
+    if value is None and key.startswith("wind_"):
+        value = entry.get("wind", {}).get(key[len("wind_"):])
+    return float(value) if value is not None else float("nan")
@@ -0,0 +1,160 @@
+# forecast_chart.py
+"""Hourly forecast charts (temperature, precipitation chance, wind)."""
+
+from typing import List, Sequence, Tuple
+
+import flet as ft
+
+from forecast import ForecastColumns
+
+Point = Tuple[float, float]
+
+# (forecast field, title, line color)
+METRICS = [
+    ("temp", "Temperature", ft.Colors.ORANGE_700),
+    ("pop", "Chance of precipitation", ft.Colors.BLUE_700),
+    ("wind_speed", "Wind", ft.Colors.TEAL_700),
+]
+
+
+def lttb(points: Sequence[Point], threshold: int) -> List[Point]:
+    """Downsample with Largest-Triangle-Three-Buckets.
+
+    Keeps the first and last points and, from each bucket in between, the
+    point forming the largest triangle with the previously kept point and
+    the average of the next bucket. Peaks and dips survive, unlike with
+    plain striding.
+    """
+    n = len(points)
+    if threshold >= n or threshold < 3:
+        return list(points)
+
+    sampled = [points[0]]
+    bucket_size = (n - 2) / (threshold - 2)
+    a = 0  # index of the last kept point
+    for i in range(threshold - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+
+        # average of the next bucket (or the last point for the final bucket)
+        next_start = end
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        if next_start >= next_end:
+            avg_x, avg_y = points[-1]
+        else:
+            span = next_end - next_start
+            avg_x = sum(p[0] for p in points[next_start:next_end]) / span
+            avg_y = sum(p[1] for p in points[next_start:next_end]) / span
+
+        ax, ay = points[a]
+        best_area = -1.0
+        best = start
+        for j in range(start, end):
+            x, y = points[j]
+            area = abs((ax - avg_x) * (y - ay) - (ax - x) * (avg_y - ay))
+            if area > best_area:
+                best_area, best = area, j
+        sampled.append(points[best])
+        a = best
+    sampled.append(points[-1])
+    return sampled
+
+
+def convert(key: str, value: float, unit: str) -> float:
+    """Convert a metric forecast value for display in `unit`."""
+    if key == "pop":
+        return value * 100
+    if unit == "imperial":
+        if key == "temp":
+            return value * 9 / 5 + 32
+        if key == "wind_speed":
+            return value * 2.236936
+    return value
+
+
+def unit_label(key: str, unit: str) -> str:
+    if key == "temp":
+        return "°F" if unit == "imperial" else "°C"
+    if key == "wind_speed":
+        return "mph" if unit == "imperial" else "m/s"
+    return "%"
+
+
+class ForecastChart:
+    """Small line charts for the hourly forecast.
+
+    The charts are built once. A new forecast replaces their points, and a
+    unit change only rewrites the y values of the existing points.
+    """
+
+    def __init__(self, updater, width: int, pixels_per_point: int = 3):
+        self.updater = updater
+        self.max_points = max(3, width // pixels_per_point)
+        self.unit = "metric"
+        self.series = {}  # field -> downsampled metric points
+        self.charts = {}  # field -> (title, chart, line)
+
+        rows = []
+        for key, title, color in METRICS:
+            line = ft.LineChartData(data_points=[], stroke_width=2, color=color, curved=True)
+            chart = ft.LineChart(
+                data_series=[line],
+                height=110,
+                width=width,
+                left_axis=ft.ChartAxis(labels_size=36),
+                bottom_axis=ft.ChartAxis(labels_size=0),
+            )
+            title_text = ft.Text(title, size=12, color=ft.Colors.GREY_700)
+            self.charts[key] = (title_text, chart, line)
+            rows.extend([title_text, chart])
+        self.view = ft.Column(rows, visible=False, spacing=4)
+
+    def set_forecast(self, forecast: dict, unit: str):
+        """Plot a forecast payload (hourly One Call or 3-hourly /forecast)."""
+        columns = ForecastColumns(forecast)
+        if not columns.times:
+            self.hide()
+            return
+        start = columns.times[0]
+        hours = [(t - start) / 3600 for t in columns.times]
+
+        self.unit = unit
+        for key, title, _color in METRICS:
+            values = columns.get(key)
+            points = [(x, y) for x, y in zip(hours, values) if y == y]  # skip NaN
+            points = lttb(points, self.max_points)
+            self.series[key] = points
+            title_text, chart, line = self.charts[key]
+            line.data_points = [ft.LineChartDataPoint(x, convert(key, y, unit)) for x, y in points]
+            title_text.value = f"{title} ({unit_label(key, unit)})"
+            self._fit_axis(key)
+        self.view.visible = True
+        self.updater.request_update()
+
+    def set_unit(self, unit: str):
+        """Switch units by updating y values in place (no chart rebuild)."""
+        if unit == self.unit:
+            return
+        self.unit = unit
+        for key in ("temp", "wind_speed"):
+            title_text, _chart, line = self.charts[key]
+            for point, (_x, y) in zip(line.data_points, self.series.get(key, [])):
+                point.y = convert(key, y, unit)
+            title_text.value = title_text.value.rsplit(" (", 1)[0] + f" ({unit_label(key, unit)})"
+            self._fit_axis(key)
+        if self.view.visible:
+            self.updater.request_update()
+
+    def _fit_axis(self, key: str):
+        _title, chart, line = self.charts[key]
+        ys = [point.y for point in line.data_points]
+        if not ys:
+            return
+        low, high = min(ys), max(ys)
+        pad = max(1.0, (high - low) * 0.1)
+        chart.min_y = 0 if key == "pop" else low - pad
+        chart.max_y = 100 if key == "pop" else high + pad
+
+    def hide(self):
+        self.view.visible = False
+        self.updater.request_update()
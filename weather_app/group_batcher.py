@@ -0,0 +1,76 @@
+# group_batcher.py
+"""Micro-batching of city-ID lookups into OpenWeather group requests."""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, List
+
+
+class GroupBatcher:
+    """Collects concurrent lookups by city ID and sends them as one request.
+
+    Lookups arriving within `window` seconds (or until `max_ids` are
+    queued) are sent together through `send`, which takes a list of city
+    IDs and returns a dict mapping each ID to its payload. Every caller
+    gets only its own city's payload back.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[List[int]], Awaitable[Dict[int, Dict]]],
+        missing_error: Callable[[int], Exception],
+        window: float = 0.05,
+        max_ids: int = 20,
+    ):
+        self.send = send
+        self.missing_error = missing_error
+        self.window = window
+        self.max_ids = max_ids
+        self._pending = {}  # city id -> future
+        self._timer = None
+        self._tasks = set()
+
+    async def get(self, city_id: int) -> Dict:
+        loop = asyncio.get_running_loop()
+        future = self._pending.get(city_id)
+        if future is None:
+            future = loop.create_future()
+            self._pending[city_id] = future
+            if len(self._pending) >= self.max_ids:
+                self.flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.window, self.flush)
+        # One caller giving up must not cancel the result for the others
+        return await asyncio.shield(future)
+
+    def flush(self):
+        """Send everything queued so far as one group request."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        task = asyncio.ensure_future(self._send_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send_batch(self, batch: Dict[int, asyncio.Future]):
+        try:
+            results = await self.send(list(batch))
+        except asyncio.CancelledError:
+            for future in batch.values():
+                future.cancel()
+            raise
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for city_id, future in batch.items():
+            if future.done():
+                continue
+            data = results.get(city_id)
+            if data is None:
+                future.set_exception(self.missing_error(city_id))
+            else:
+                future.set_result(data)
@@ -0,0 +1,84 @@
+# history_store.py
+"""Per-user search history files, safe to share between sessions."""
+
+import json
+import os
+import re
+import tempfile
+import threading
+import uuid
+from pathlib import Path
+from typing import List
+
+APP_DIR = Path(__file__).parent
+LOCAL_HISTORY_FILE = APP_DIR / "search_history.json"
+HISTORY_DIR = APP_DIR / "history"
+USER_ID_KEY = "weather_app.user_id"
+
+# One lock per file, shared by every session in this process
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def _lock_for(path: Path) -> threading.Lock:
+    with _locks_guard:
+        return _locks.setdefault(str(path), threading.Lock())
+
+
+def user_id_for(page) -> str:
+    """Identify the user behind a Flet page.
+
+    Desktop apps have a single local user. Web sessions keep a random id in
+    the browser's client storage, so a user gets the same history back on
+    their next visit while other users never see it.
+    """
+    if not getattr(page, "web", False):
+        return "local"
+    try:
+        user_id = page.client_storage.get(USER_ID_KEY)
+        if not user_id:
+            user_id = uuid.uuid4().hex
+            page.client_storage.set(USER_ID_KEY, user_id)
+        return str(user_id)
+    except Exception:
+        return getattr(page, "session_id", None) or uuid.uuid4().hex
+
+
+class HistoryStore:
+    """Loads and saves one user's search history.
+
+    Writes go to a temporary file that is then renamed over the real one,
+    so a reader never sees a half-written file, and concurrent writers in
+    this process are serialized by a per-file lock.
+    """
+
+    def __init__(self, user_id: str = "local"):
+        if user_id == "local":
+            self.path = LOCAL_HISTORY_FILE
+        else:
+            safe_id = re.sub(r"[^A-Za-z0-9_-]", "_", user_id)[:64] or "anonymous"
+            self.path = HISTORY_DIR / f"{safe_id}.json"
+        self._lock = _lock_for(self.path)
+
+    def load(self) -> List[str]:
+        try:
+            with self._lock, open(self.path, "r", encoding="utf-8") as f:
+                history = json.load(f)
+            return [h for h in history if isinstance(h, str)]
+        except (OSError, ValueError):
+            return []
+
+    def save(self, history: List[str]):
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(history, f, ensure_ascii=False, indent=2)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
@@ -1,19 +1,45 @@
 import flet as ft
 import asyncio
-from weather_service import WeatherService, WeatherServiceError
+from weather_service import WeatherServiceError, get_shared_service
 from config import Config
-import json
+from update_scheduler import UpdateScheduler
+from dashboard import DashboardView, load_dashboard_cities
+from history_store import HistoryStore, user_id_for
+from forecast_chart import ForecastChart
+import logging
 from pathlib import Path
 import speech_recognition as sr
 import pyttsx3
+import sys
 import threading
+import time
+
+logger = logging.getLogger(__name__)
 
 class WeatherApp:
     """Main Weather Application class."""
     
     def __init__(self, page: ft.Page):
         self.page = page
-        self.weather_service = WeatherService()
+        # Coalesce page.update() calls into at most one per frame
+        self.updater = UpdateScheduler(page)
+        # One service (HTTP client, cache, rate limiter) for every session
+        self.weather_service = get_shared_service()
+        self.history_store = HistoryStore(user_id_for(page))
+        # Background tasks and the currently running search (latest wins)
+        self._tasks = set()
+        self._search_task = None
+        self._search_generation = 0
+        # Auto-refresh of the displayed city (paused while the window is
+        # hidden or the dashboard is shown instead)
+        self._refresh_task = None
+        self._window_visible = asyncio.Event()
+        self._window_visible.set()
+        self._single_view_shown = asyncio.Event()
+        self._single_view_shown.set()
+        self.page.on_app_lifecycle_state_change = self.on_lifecycle_change
+        if Config.DEBUG:
+            self.enable_task_debugging()
         self.setup_page()
         self.load_history()
         self.build_ui()
@@ -118,7 +144,19 @@ class WeatherApp:
         # Suggestions container (search history / autocomplete)
         self.suggestions_container = ft.Column([], visible=False, spacing=0)
         
-        controls_right = ft.Row([ft.Row([self.unit_toggle_btn], spacing=12), self.theme_button], spacing=12)
+        # Dashboard toggle (multi-city view)
+        self.dashboard_button = ft.IconButton(
+            icon=ft.Icons.DASHBOARD,
+            tooltip="Show dashboard",
+            on_click=self.toggle_dashboard,
+        )
+        self.dashboard = DashboardView(self.weather_service, self.updater, lambda: self.unit)
+        self.dashboard_task = None
+
+        controls_right = ft.Row(
+            [ft.Row([self.unit_toggle_btn], spacing=12), self.dashboard_button, self.theme_button],
+            spacing=12,
+        )
 
         title_row = ft.Row(
             [
@@ -131,11 +169,12 @@ class WeatherApp:
         # Loading indicator (for requests)
         self.loading = ft.ProgressRing(visible=False)
 
-        # Main column with all components
-        main_column = ft.Column(
+        # Hourly forecast charts (shown below the current weather)
+        self.forecast_chart = ForecastChart(self.updater, Config.APP_WIDTH - 60)
+
+        # Single-city view
+        self.single_view = ft.Column(
             [
-                title_row,
-                ft.Divider(height=20, color=ft.Colors.TRANSPARENT),
                 self.city_input,
                 self.suggestions_container,
                 self.search_button,
@@ -144,6 +183,19 @@ class WeatherApp:
                 self.loading,
                 self.error_message,
                 self.weather_container,
+                self.forecast_chart.view,
+            ],
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            spacing=15,
+        )
+
+        # Main column with all components
+        main_column = ft.Column(
+            [
+                title_row,
+                ft.Divider(height=20, color=ft.Colors.TRANSPARENT),
+                self.single_view,
+                self.dashboard.view,
             ],
             horizontal_alignment=ft.CrossAxisAlignment.CENTER,
             spacing=15,
@@ -186,27 +238,14 @@ class WeatherApp:
     
     async def on_search_async(self, e):
         """Async event handler."""
-        await self.get_weather()
-
-        self.search_button = ft.ElevatedButton(
-            "Search",
-            on_click=self.on_search_async,
-        )
+        self.start_search()
 
     # ------------------------- Search history helpers -------------------------
     def history_file(self) -> Path:
-        return Path(__file__).parent / "search_history.json"
+        return self.history_store.path
 
     def load_history(self):
-        try:
-            path = self.history_file()
-            if path.exists():
-                with open(path, "r", encoding="utf-8") as f:
-                    self.history = json.load(f)
-            else:
-                self.history = []
-        except Exception:
-            self.history = []
+        self.history = self.history_store.load()
 
     # ------------------------- Utility / async helpers -------------------------
     def schedule_task(self, coro_or_factory, *args, **kwargs):
@@ -221,12 +260,12 @@ class WeatherApp:
             else:
                 coro = coro_or_factory
             loop = asyncio.get_running_loop()
-            return loop.create_task(coro)
+            return self._track_task(loop.create_task(coro))
         except Exception:
             try:
                 if coro is None:
                     return None
-                return asyncio.ensure_future(coro)
+                return self._track_task(asyncio.ensure_future(coro))
             except Exception:
                 try:
                     if coro is not None:
@@ -235,13 +274,64 @@ class WeatherApp:
                     pass
                 return None
 
+    def _track_task(self, task):
+        """Keep a reference to a scheduled task until it finishes."""
+        self._tasks.add(task)
+        task.add_done_callback(self._on_task_done)
+        return task
+
+    def _on_task_done(self, task):
+        self._tasks.discard(task)
+        if task.cancelled() or not Config.DEBUG:
+            return
+        exc = task.exception()
+        if exc is not None:
+            logger.error("Background task %r failed", task, exc_info=exc)
+
+    def enable_task_debugging(self):
+        """Report unawaited coroutines and tasks still pending at session close."""
+        try:
+            # asyncio debug mode records where never-awaited coroutines were created
+            self.page.loop.set_debug(True)
+        except Exception:
+            pass
+        try:
+            self.page.on_close = lambda e: self.report_pending_tasks()
+        except Exception:
+            pass
+
+    def report_pending_tasks(self):
+        """Log tasks that were never awaited to completion."""
+        pending = [t for t in self._tasks if not t.done()]
+        for task in pending:
+            logger.warning("Task still pending at session close: %r", task)
+        return pending
+
+    # ------------------------- Search task supervision -------------------------
+    def start_search(self):
+        """Start a weather search, cancelling any search still in flight.
+
+        Only the newest search is allowed to render its result, so a slow
+        request for a previous city can never overwrite the current one.
+        """
+        previous = self._search_task
+        if previous is not None and not previous.done():
+            previous.cancel()
+        self.stop_auto_refresh()
+        self._search_generation += 1
+        self._search_task = self.schedule_task(self.get_weather, self._search_generation)
+        return self._search_task
+
+    def _is_current_search(self, generation) -> bool:
+        return generation is None or generation == self._search_generation
+
     def clear_input(self, e=None):
         """Clear the city input field."""
         try:
             self.city_input.value = ""
             self.suggestions_container.controls = []
             self.suggestions_container.visible = False
-            self.page.update()
+            self.updater.request_update()
         except Exception:
             pass
 
@@ -263,7 +353,7 @@ class WeatherApp:
                     self.unit_f_btn.color = ft.Colors.BLUE_700
                     self.unit_c_btn.bgcolor = ft.Colors.TRANSPARENT
                     self.unit_c_btn.color = ft.Colors.GREY_600
-                self.page.update()
+                self.updater.request_update()
         except Exception:
             pass
         try:
@@ -333,7 +423,7 @@ class WeatherApp:
             # keep the weather container visible
             if hasattr(self, 'weather_container'):
                 self.weather_container.visible = True
-            self.page.update()
+            self.updater.request_update()
         except Exception:
             pass
 
@@ -342,7 +432,7 @@ class WeatherApp:
         try:
             if hasattr(self, 'mode_overlay'):
                 self.mode_overlay.visible = True
-                self.page.update()
+                self.updater.request_update()
         except Exception:
             pass
 
@@ -351,7 +441,7 @@ class WeatherApp:
         try:
             if hasattr(self, 'mode_overlay'):
                 self.mode_overlay.visible = False
-                self.page.update()
+                self.updater.request_update()
         except Exception:
             pass
 
@@ -359,15 +449,13 @@ class WeatherApp:
         await asyncio.sleep(0.1)
         try:
             self.weather_container.opacity = 1
-            self.page.update()
+            self.updater.request_update()
         except Exception:
             pass
 
     def save_history(self):
         try:
-            path = self.history_file()
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(self.history, f, ensure_ascii=False, indent=2)
+            self.history_store.save(list(self.history))
         except Exception:
             pass
 
@@ -396,19 +484,15 @@ class WeatherApp:
         self.input_focused = False
         self.suggestions_container.controls = []
         self.suggestions_container.visible = False
-        self.page.update()
+        self.updater.request_update()
 
     def make_suggestion_handler(self, suggestion: str):
-        def handler(e):
+        async def handler(e):
             try:
                 self.city_input.value = suggestion
                 self.suggestions_container.visible = False
-                self.page.update()
-                try:
-                    self.schedule_task(self.get_weather)
-                except Exception:
-                    import asyncio
-                    asyncio.create_task(self.get_weather())
+                self.updater.request_update()
+                self.start_search()
             except Exception:
                 pass
         return handler
@@ -418,7 +502,7 @@ class WeatherApp:
         if not value or not getattr(self, "input_focused", True):
             self.suggestions_container.controls = []
             self.suggestions_container.visible = False
-            self.page.update()
+            self.updater.request_update()
             return
 
         matches = [h for h in self.history if value.lower() in h.lower()]
@@ -441,10 +525,14 @@ class WeatherApp:
 
         self.suggestions_container.controls = controls
         self.suggestions_container.visible = True
-        self.page.update()
+        self.updater.request_update()
     
-    async def get_weather(self):
-        """Fetch and display weather data."""
+    async def get_weather(self, generation=None):
+        """Fetch and display weather data.
+
+        ``generation`` identifies the search started by ``start_search``; a
+        search that has been superseded does not touch the UI.
+        """
         city = self.city_input.value.strip()
         
         # Validate input
@@ -456,24 +544,141 @@ class WeatherApp:
         self.loading.visible = True
         self.error_message.visible = False
         self.weather_container.visible = False
-        self.page.update()
+        self.forecast_chart.view.visible = False
+        self.updater.request_update()
         
         try:
             # Fetch weather data
             weather_data = await self.weather_service.get_weather(city)
-            
+
+            # A newer search started while this one was in flight
+            if not self._is_current_search(generation):
+                return
+
             # Display weather
             self.display_weather(weather_data)
+            self.schedule_task(self.load_forecast_chart, weather_data, generation)
+            if Config.AUTO_REFRESH:
+                self.start_auto_refresh(city, weather_data)
 
         except WeatherServiceError as e:
-            self.show_error(str(e))
+            if self._is_current_search(generation):
+                self.show_error(str(e))
             
         except Exception as e:
-            self.show_error("An unexpected error occured. Please try again.")
+            if self._is_current_search(generation):
+                self.show_error("An unexpected error occured. Please try again.")
         
         finally:
-            self.loading.visible = False
-            self.page.update()
+            # The newer search owns the loading indicator
+            if self._is_current_search(generation):
+                self.loading.visible = False
+                # End of the search: send everything that changed in one update
+                self.updater.flush()
+
+    async def load_forecast_chart(self, data: dict, generation=None):
+        """Fetch the hourly forecast for the displayed city and plot it."""
+        coord = data.get("coord") or {}
+        if "lat" not in coord or "lon" not in coord:
+            return
+        try:
+            forecast = await self.weather_service.get_hourly_forecast(coord["lat"], coord["lon"])
+        except WeatherServiceError:
+            # The chart is optional; the current weather is already shown
+            if self._is_current_search(generation):
+                self.forecast_chart.hide()
+            return
+        if self._is_current_search(generation):
+            self.forecast_chart.set_forecast(forecast, self.unit)
+
+    # ----------------- Auto-refresh -----------------
+    def start_auto_refresh(self, city: str, data: dict):
+        """Keep the displayed city up to date until the next search."""
+        self.stop_auto_refresh()
+        self._refresh_task = self.schedule_task(self._auto_refresh_loop, city, data)
+
+    def stop_auto_refresh(self):
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._refresh_task.cancel()
+        self._refresh_task = None
+
+    async def on_lifecycle_change(self, e):
+        """Pause auto-refresh while the app window is hidden."""
+        state = getattr(e, "state", None)
+        if state in (ft.AppLifecycleState.HIDE, ft.AppLifecycleState.PAUSE):
+            self._window_visible.clear()
+        elif state in (ft.AppLifecycleState.SHOW, ft.AppLifecycleState.RESUME):
+            self._window_visible.set()
+
+    def next_refresh_delay(self, data: dict, unchanged: int) -> float:
+        """Seconds until a newer observation is likely to be available.
+
+        OpenWeather publishes a new observation roughly every
+        OBSERVATION_INTERVAL seconds after the payload's `dt`. Each refresh
+        that returns the same observation doubles the wait.
+        """
+        observed = data.get("dt") or time.time()
+        delay = observed + Config.OBSERVATION_INTERVAL - time.time()
+        delay = max(Config.AUTO_REFRESH_MIN, delay) * (2 ** min(unchanged, 5))
+        return min(delay, Config.AUTO_REFRESH_MAX)
+
+    async def _auto_refresh_loop(self, city: str, data: dict):
+        unchanged = 0
+        while True:
+            await asyncio.sleep(self.next_refresh_delay(data, unchanged))
+            while not (self._window_visible.is_set() and self._single_view_shown.is_set()):
+                await self._window_visible.wait()
+                await self._single_view_shown.wait()
+            try:
+                fresh = await self.weather_service.get_weather(city, refresh=True)
+            except WeatherServiceError:
+                # Keep showing the last result and try again later
+                unchanged += 1
+                continue
+            if fresh.get("dt") == data.get("dt"):
+                unchanged += 1
+                continue
+            unchanged = 0
+            data = fresh
+            self.refresh_weather_card(fresh)
+
+    def refresh_weather_card(self, data: dict):
+        """Update only the fields of the existing weather card that changed."""
+        self.last_weather_data = data
+        col = getattr(self.weather_container, 'content', None)
+        if not isinstance(col, ft.Column) or len(col.controls) < 6:
+            return
+
+        temp = data.get("main", {}).get("temp", 0)
+        feels_like = data.get("main", {}).get("feels_like", 0)
+        wind_speed = data.get("wind", {}).get("speed", 0)
+        weather = data.get("weather", [{}])[0]
+        if self.unit == "imperial":
+            display_temp = f"{temp*9/5 + 32:.1f}°F"
+            display_feels = f"Feels like {feels_like*9/5 + 32:.1f}°F"
+            wind_display = f"{(wind_speed * 2.236936):.1f} mph"
+        else:
+            display_temp = f"{temp:.1f}°C"
+            display_feels = f"Feels like {feels_like:.1f}°C"
+            wind_display = f"{wind_speed:.1f} m/s"
+
+        icon_row = col.controls[1]
+        info_row = col.controls[5]
+        fields = [
+            (icon_row.controls[0], "src", f"https://openweathermap.org/img/wn/{weather.get('icon', '01d')}@2x.png"),
+            (icon_row.controls[1], "value", weather.get("description", "").title()),
+            (col.controls[2], "value", display_temp),
+            (col.controls[3], "value", display_feels),
+            (info_row.controls[0].content.controls[2], "value", f"{data.get('main', {}).get('humidity', 0)}%"),
+            (info_row.controls[1].content.controls[2], "value", wind_display),
+        ]
+        changed = False
+        for control, attr, value in fields:
+            if getattr(control, attr, None) != value:
+                setattr(control, attr, value)
+                changed = True
+        if changed:
+            self.updater.request_update()
 
     # ----------------- Voice recognition -----------------
     def schedule_voice_search(self, e):
@@ -484,7 +689,7 @@ class WeatherApp:
     async def capture_speech(self, e):
         recognizer = sr.Recognizer()
         self.show_error("Listening...")
-        self.page.update()
+        self.updater.request_update()
 
         try:
             # Run blocking microphone listening in a separate thread
@@ -492,22 +697,25 @@ class WeatherApp:
             try:
                 city_name = recognizer.recognize_google(audio)
                 self.city_input.value = city_name
-                self.page.update()
-                await self.get_weather()  # fetch weather after recognition
+                self.updater.request_update()
+                # fetch weather after recognition
+                task = self.start_search()
+                if task is not None:
+                    await asyncio.wait({task})
             except sr.UnknownValueError:
                 self.show_error("Could not understand audio")
-                self.page.update()
+                self.updater.request_update()
             except sr.RequestError:
                 self.show_error("Speech service unavailable")
-                self.page.update()
+                self.updater.request_update()
         except Exception:
             self.show_error("Microphone error")
-            self.page.update()
+            self.updater.request_update()
         finally:
             # Hide temporary message after 2 sec
             await asyncio.sleep(2)
             self.error_message.visible = False
-            self.page.update()
+            self.updater.request_update()
 
     def listen_microphone(self, recognizer):
         """Blocking call for listening."""
@@ -628,13 +836,13 @@ class WeatherApp:
         self.weather_container.opacity = 0
         self.weather_container.visible = True
         self.error_message.visible = False
-        self.page.update()
+        self.updater.request_update()
 
         try:
             self.schedule_task(self._fade_in_weather)
         except Exception:
             self.weather_container.opacity = 1
-            self.page.update()
+            self.updater.request_update()
 
         try:
             self.update_history(city_name)
@@ -679,7 +887,7 @@ class WeatherApp:
         new_color = ft.Colors.BLACK if self.page.theme_mode == ft.ThemeMode.LIGHT else ft.Colors.WHITE
         self.title.color = new_color
 
-        self.page.update()
+        self.updater.request_update()
 
         try:
             self.schedule_task(self._hide_mode_loader_after, 0.6)
@@ -723,7 +931,29 @@ class WeatherApp:
 
         if self.last_weather_data:
             self.update_temperature_display(self.last_weather_data)
-        self.page.update()
+        self.dashboard.refresh_units()
+        self.forecast_chart.set_unit(self.unit)
+        self.updater.flush()
+
+    async def toggle_dashboard(self, e):
+        """Switch between the single-city view and the multi-city dashboard."""
+        showing = not self.dashboard.view.visible
+        self.dashboard.view.visible = showing
+        self.single_view.visible = not showing
+        self.dashboard_button.tooltip = "Show single city" if showing else "Show dashboard"
+
+        if showing:
+            # The single-city card is hidden, so stop refreshing it
+            self._single_view_shown.clear()
+            self.dashboard.set_cities(load_dashboard_cities(fallback=self.history))
+            self.dashboard_task = self.schedule_task(self.dashboard.run)
+        else:
+            self._single_view_shown.set()
+            if self.dashboard_task is not None:
+                # Stop fetching and the refresh schedule while hidden
+                self.dashboard_task.cancel()
+                self.dashboard_task = None
+        self.updater.flush()
 
     async def switch_theme_with_loading(self):
         if self.is_dark_mode:
@@ -733,7 +963,7 @@ class WeatherApp:
         
         self.theme_loading_overlay.content.controls[1].value = message
         self.theme_loading_overlay.visible = True
-        self.page.update()
+        self.updater.request_update()
         
         # Wait briefly for effect
         await asyncio.sleep(0.8)
@@ -743,7 +973,7 @@ class WeatherApp:
         self.page.theme_mode = ft.ThemeMode.DARK if self.is_dark_mode else ft.ThemeMode.LIGHT
         
         self.theme_loading_overlay.visible = False
-        self.page.update()
+        self.updater.request_update()
 
 
     
@@ -752,11 +982,29 @@ class WeatherApp:
         self.error_message.value = f"❌ {message}"
         self.error_message.visible = True
         self.weather_container.visible = False
-        self.page.update()
+        self.updater.request_update()
+
+
+# FLET_PROFILE=1 times every event handler with tools/handler_profiler.py
+# (for a `flet build` package, copy that file next to this one)
+TOOLS_DIR = Path(__file__).resolve().parent.parent / "tools"
+
+
+def profile_handlers(page: ft.Page):
+    if str(TOOLS_DIR) not in sys.path:
+        sys.path.append(str(TOOLS_DIR))
+    try:
+        from handler_profiler import install_from_env
+    except ImportError:
+        logger.warning("FLET_PROFILE is set but handler_profiler.py was not found")
+        return
+    install_from_env(page)
 
 
 def main(page: ft.Page):
     """Main entry point."""
+    if Config.PROFILE_HANDLERS:
+        profile_handlers(page)
     WeatherApp(page)
 
 
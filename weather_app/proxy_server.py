@@ -0,0 +1,159 @@
+# proxy_server.py
+"""Local HTTP caching proxy in front of WeatherService.
+
+All clients share one WeatherService, so they share its response cache,
+request coalescing and rate limit (and one API key).
+
+Usage:
+    python proxy_server.py --port 8080
+
+Endpoints:
+    GET /weather?q=London
+    GET /weather?lat=51.5&lon=-0.12
+    GET /forecast?lat=51.5&lon=-0.12
+
+Responses carry an ETag and Cache-Control max-age matching the time left in
+the service cache; a request with a matching If-None-Match gets 304.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import sys
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+from config import Config
+from weather_service import WeatherService, WeatherServiceError
+
+MAX_HEADER_BYTES = 16 * 1024
+
+
+class WeatherProxy:
+    """Minimal asyncio HTTP/1.1 server (GET only, one request per connection)."""
+
+    def __init__(self, service: WeatherService):
+        self.service = service
+
+    async def handle_connection(self, reader, writer):
+        try:
+            try:
+                head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=10)
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError):
+                return
+            if len(head) > MAX_HEADER_BYTES:
+                await self.send(writer, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, {"error": "Headers too large"})
+                return
+
+            lines = head.decode("latin-1").split("\r\n")
+            try:
+                method, target, _version = lines[0].split(" ", 2)
+            except ValueError:
+                await self.send(writer, HTTPStatus.BAD_REQUEST, {"error": "Malformed request line"})
+                return
+            headers = {}
+            for line in lines[1:]:
+                if ":" in line:
+                    name, value = line.split(":", 1)
+                    headers[name.strip().lower()] = value.strip()
+
+            if method != "GET":
+                await self.send(writer, HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Only GET is supported"})
+                return
+
+            status, body, max_age = await self.route(target)
+            await self.send(writer, status, body, max_age, headers.get("if-none-match"))
+        except Exception as e:
+            try:
+                await self.send(writer, HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)})
+            except Exception:
+                pass
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+    async def route(self, target: str):
+        """Return (status, json body, max-age seconds) for a request target."""
+        url = urlsplit(target)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        try:
+            if url.path == "/weather" and query.get("q"):
+                city = query["q"]
+                data = await self.service.get_weather(city)
+                key = self.service.weather_key(city)
+            elif url.path in ("/weather", "/forecast") and "lat" in query and "lon" in query:
+                try:
+                    lat, lon = float(query["lat"]), float(query["lon"])
+                except ValueError:
+                    return HTTPStatus.BAD_REQUEST, {"error": "lat and lon must be numbers"}, 0
+                if url.path == "/weather":
+                    data = await self.service.get_weather_by_coordinates(lat, lon)
+                    key = self.service.coordinates_key(lat, lon)
+                else:
+                    data = await self.service.get_hourly_forecast(lat, lon)
+                    key = self.service.forecast_key(lat, lon)
+            elif url.path in ("/weather", "/forecast"):
+                return HTTPStatus.BAD_REQUEST, {"error": "Missing q or lat/lon parameters"}, 0
+            else:
+                return HTTPStatus.NOT_FOUND, {"error": "Unknown endpoint"}, 0
+        except WeatherServiceError as e:
+            status = e.status_code if e.status_code in (400, 401, 404) else HTTPStatus.BAD_GATEWAY
+            return HTTPStatus(status), {"error": str(e)}, 0
+
+        return HTTPStatus.OK, data, int(self.service.expires_in(key, data))
+
+    async def send(self, writer, status, body, max_age: int = 0, if_none_match=None):
+        payload = json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        headers = {
+            "Content-Type": "application/json; charset=utf-8",
+            "Connection": "close",
+        }
+        if status == HTTPStatus.OK:
+            etag = '"' + hashlib.sha1(payload).hexdigest()[:20] + '"'
+            headers["ETag"] = etag
+            headers["Cache-Control"] = f"public, max-age={max_age}"
+            if if_none_match and etag in [t.strip() for t in if_none_match.split(",")]:
+                status, payload = HTTPStatus.NOT_MODIFIED, b""
+        else:
+            headers["Cache-Control"] = "no-store"
+        if status != HTTPStatus.NOT_MODIFIED:
+            headers["Content-Length"] = str(len(payload))
+
+        head = f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        head += "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+        writer.write(head.encode("latin-1") + b"\r\n" + payload)
+        await writer.drain()
+
+
+async def serve(host: str, port: int):
+    async with WeatherService() as service:
+        proxy = WeatherProxy(service)
+        server = await asyncio.start_server(proxy.handle_connection, host, port)
+        print(f"Weather proxy listening on http://{host}:{port}", file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Serve cached OpenWeather lookups over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="port to listen on (default: 8080)")
+    args = parser.parse_args(argv)
+
+    if not Config.API_KEY:
+        print("OPENWEATHER_API_KEY is not set.", file=sys.stderr)
+        return 2
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
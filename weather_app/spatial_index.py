@@ -0,0 +1,138 @@
+# spatial_index.py
+"""Grid-bucketed index of recently fetched locations."""
+
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlam = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlam / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def payload_coordinates(data: Dict) -> Optional[Tuple[float, float]]:
+    """Extract (lat, lon) from a current-weather or forecast payload."""
+    coord = data.get("coord")
+    if isinstance(coord, dict) and "lat" in coord and "lon" in coord:
+        return float(coord["lat"]), float(coord["lon"])
+    if "lat" in data and "lon" in data:
+        return float(data["lat"]), float(data["lon"])
+    return None
+
+
+class LocationIndex:
+    """Recent observations bucketed on a lat/lon grid.
+
+    Lookups only scan the grid cells that overlap the search radius, so a
+    coordinate query costs a handful of distance checks regardless of how
+    many locations are stored. Current-weather payloads double as a small
+    gazetteer: they carry the city name and country for their coordinates.
+    """
+
+    def __init__(self, cell_degrees: float = 0.1, max_entries: int = 5000):
+        self.cell_degrees = cell_degrees
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # (kind, lat, lon) -> (lat, lon, stored_at, data)
+        self._buckets = {}  # (kind, cell_lat, cell_lon) -> set of entry keys
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_degrees), math.floor(lon / self.cell_degrees)
+
+    def add(self, kind: str, data: Dict):
+        """Remember a payload of the given kind ("weather" or "forecast")."""
+        coords = payload_coordinates(data)
+        if coords is None:
+            return
+        lat, lon = coords
+        key = (kind, round(lat, 4), round(lon, 4))
+        if key not in self._entries:
+            self._buckets.setdefault((kind, *self._cell(lat, lon)), set()).add(key)
+        self._entries[key] = (lat, lon, time.monotonic(), data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        lat, lon, _stored_at, _data = self._entries.pop(key)
+        bucket_key = (key[0], *self._cell(lat, lon))
+        bucket = self._buckets.get(bucket_key)
+        if bucket is not None:
+            bucket.discard(key)
+            if not bucket:
+                del self._buckets[bucket_key]
+
+    def _candidates(self, kind: str, lat: float, lon: float, radius_km: float):
+        """Yield entries in grid cells that may lie within `radius_km`."""
+        dlat = radius_km / 111.0
+        # longitude degrees shrink towards the poles
+        dlon = radius_km / max(1e-6, 111.0 * math.cos(math.radians(lat)))
+        dlon = min(dlon, 180.0)
+        lat_lo, lon_lo = self._cell(lat - dlat, lon - dlon)
+        lat_hi, lon_hi = self._cell(lat + dlat, lon + dlon)
+        for cell_lat in range(lat_lo, lat_hi + 1):
+            for cell_lon in range(lon_lo, lon_hi + 1):
+                for key in self._buckets.get((kind, cell_lat, cell_lon), ()):
+                    yield self._entries[key]
+
+    def nearest(
+        self,
+        kind: str,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        max_age: Optional[float] = None,
+    ) -> Optional[Dict]:
+        """Return the closest payload within `radius_km` that is at most `max_age` seconds old."""
+        now = time.monotonic()
+        best = None
+        best_distance = radius_km
+        for e_lat, e_lon, stored_at, data in self._candidates(kind, lat, lon, radius_km):
+            if max_age is not None and now - stored_at > max_age:
+                continue
+            distance = haversine_km(lat, lon, e_lat, e_lon)
+            if distance <= best_distance:
+                best, best_distance = data, distance
+        return best
+
+    def age(self, kind: str, data: Dict) -> Optional[float]:
+        """Seconds since `data` was stored, or None if it is not (or no longer) stored."""
+        coords = payload_coordinates(data)
+        if coords is None:
+            return None
+        entry = self._entries.get((kind, round(coords[0], 4), round(coords[1], 4)))
+        if entry is None or entry[3] is not data:
+            return None
+        return time.monotonic() - entry[2]
+
+    def nearest_city(self, lat: float, lon: float, max_km: float = 50.0) -> Optional[Tuple[str, str]]:
+        """Map coordinates to the closest known city as (name, country).
+
+        Uses names from earlier current-weather responses, so no reverse
+        geocoding request is made.
+        """
+        best = None
+        best_distance = max_km
+        for e_lat, e_lon, _stored_at, data in self._candidates("weather", lat, lon, max_km):
+            name = data.get("name")
+            if not name:
+                continue
+            distance = haversine_km(lat, lon, e_lat, e_lon)
+            if distance <= best_distance:
+                best = (name, data.get("sys", {}).get("country", ""))
+                best_distance = distance
+        return best
+
+    def clear(self):
+        self._entries.clear()
+        self._buckets.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,76 @@
+# update_scheduler.py
+"""Frame-coalesced page updates for Flet apps."""
+
+import asyncio
+import threading
+
+
+class UpdateScheduler:
+    """Marks a page dirty and flushes it at most once per frame.
+
+    Every ``page.update()`` serializes the changed controls and sends them to
+    the client, so a single event handler that updates four times costs four
+    round-trips. ``request_update`` only marks the page dirty; the actual
+    ``page.update()`` happens once per ``interval`` (one frame at 60 fps by
+    default) or when ``flush`` is called at the end of a handler.
+    """
+
+    def __init__(self, page, interval: float = 0.016):
+        self.page = page
+        self.interval = interval
+        self._dirty = False
+        self._handle = None
+        self._lock = threading.Lock()
+
+    def request_update(self):
+        """Mark the page dirty and make sure a flush is scheduled."""
+        with self._lock:
+            self._dirty = True
+            if self._handle is not None:
+                return
+            self._handle = True  # reserved until the timer is armed
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if loop is not None:
+            # Called from the event loop (async handlers)
+            self._arm(loop)
+            return
+
+        # Sync handlers run in a worker thread; hand the timer to the page loop
+        page_loop = getattr(self.page, "loop", None)
+        if page_loop is not None and page_loop.is_running():
+            try:
+                page_loop.call_soon_threadsafe(self._arm, page_loop)
+                return
+            except RuntimeError:
+                pass
+
+        # No loop available (e.g. during startup): flush right away
+        self.flush()
+
+    def _arm(self, loop):
+        with self._lock:
+            if not self._dirty:
+                self._handle = None
+                return
+            self._handle = loop.call_later(self.interval, self.flush)
+
+    def flush(self):
+        """Send pending changes now, if there are any."""
+        with self._lock:
+            handle = self._handle
+            self._handle = None
+            dirty = self._dirty
+            self._dirty = False
+        if handle is not None and handle is not True:
+            handle.cancel()
+        if not dirty:
+            return
+        try:
+            self.page.update()
+        except Exception:
+            pass
@@ -1,15 +1,25 @@
 # weather_service.py
 """Weather API service layer."""
 
+import asyncio
+import threading
 import httpx
-from typing import Dict, Optional
-from config import Config
+from contextlib import asynccontextmanager
+from typing import Dict, Iterable, Optional
+from config import Config, watch_env_file
+from cache import RateLimiter, TTLCache
+from group_batcher import GroupBatcher
+from spatial_index import LocationIndex
 from pathlib import Path
 
 
 class WeatherServiceError(Exception):
     """Custom exception for weather service errors."""
-    pass
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        # Upstream HTTP status, when the error came from an API response
+        self.status_code = status_code
 
 
 class WeatherService:
@@ -27,12 +37,159 @@ class WeatherService:
             # We do not raise here to keep instantiation lightweight; callers
             # will get a descriptive error when calling `get_weather`.
             pass
-    async def get_weather(self, city: str) -> Dict:
+
+        # Shared HTTP client, opened with `async with WeatherService() as service`.
+        # Without it every request creates (and tears down) its own client.
+        self.client: Optional[httpx.AsyncClient] = None
+        self._config_watcher = None
+
+        # Responses are cached and identical in-flight requests are shared,
+        # so several callers asking for the same city cost one API call.
+        self.cache = TTLCache(Config.CACHE_TTL)
+        self.rate_limiter = RateLimiter(Config.RATE_LIMIT_PER_MINUTE)
+        self._inflight = {}  # cache key -> [task, waiter count]
+
+        # Recently fetched locations, so nearby coordinates (GPS jitter) reuse them
+        self.locations = LocationIndex()
+
+        # City IDs learned from earlier responses; with GROUP_BATCHING on,
+        # concurrent lookups of known cities share one group request.
+        self.city_ids = {}  # normalized city name -> OpenWeather city id
+        self.group_batcher = GroupBatcher(
+            self._fetch_group,
+            lambda city_id: WeatherServiceError(f"City id {city_id} not found.", status_code=404),
+            window=Config.GROUP_BATCH_WINDOW,
+        )
+
+    async def __aenter__(self):
+        if self.client is None:
+            self.client = httpx.AsyncClient(timeout=self.timeout)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close the shared HTTP client, if one is open."""
+        if self._config_watcher is not None:
+            self._config_watcher.cancel()
+            self._config_watcher = None
+        if self.client is not None:
+            client, self.client = self.client, None
+            await client.aclose()
+
+    @asynccontextmanager
+    async def _get_client(self):
+        """Yield the shared client, or a short-lived one if none is open."""
+        self._ensure_config_watcher()
+        if self.client is not None:
+            yield self.client
+        else:
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                yield client
+
+    # ------------------------- Hot reload -------------------------
+    def _ensure_config_watcher(self):
+        """Start watching .env (WEATHER_WATCH_ENV) once an event loop is running."""
+        if self._config_watcher is None and Config.WATCH_ENV:
+            self._config_watcher = asyncio.ensure_future(watch_env_file(self.apply_config))
+
+    def apply_config(self, changed: set):
+        """Apply reloaded settings, rebuilding only what they affect."""
+        self.api_key = Config.API_KEY
+        self.base_url = Config.BASE_URL
+        self.timeout = Config.TIMEOUT
+
+        if self.client is not None and changed & {"TIMEOUT"}:
+            old_client = self.client
+            self.client = httpx.AsyncClient(timeout=self.timeout)
+            asyncio.ensure_future(self._close_after(old_client, self.timeout + 1))
+
+        if changed & {"API_KEY", "BASE_URL"}:
+            # Responses fetched with the old key/endpoint are stale
+            self.cache.clear()
+            self.locations.clear()
+            self.city_ids.clear()
+
+    async def _close_after(self, client, delay: float):
+        """Close a replaced client once requests still using it have finished."""
+        await asyncio.sleep(delay)
+        await client.aclose()
+
+    # ------------------------- Cache / coalescing helpers -------------------------
+    def weather_key(self, city: str):
+        return ("weather", city.strip().lower(), Config.UNITS)
+
+    def coordinates_key(self, lat: float, lon: float):
+        return ("coords", round(float(lat), 4), round(float(lon), 4), Config.UNITS)
+
+    def forecast_key(self, lat: float, lon: float):
+        return ("forecast", round(float(lat), 4), round(float(lon), 4), Config.UNITS)
+
+    def expires_in(self, key, data: Dict) -> float:
+        """Seconds until `data`, returned for `key`, goes stale.
+
+        A coordinate lookup may be answered by a nearby observation, which
+        is stored under its own coordinates rather than `key`.
+        """
+        remaining = self.cache.expires_in(key)
+        if remaining > 0:
+            return remaining
+        age = self.locations.age("forecast" if key[0] == "forecast" else "weather", data)
+        if age is None:
+            return 0.0
+        return max(0.0, Config.CACHE_TTL - age)
+
+    async def _cached(self, key, fetch, refresh: bool = False):
+        """Return a cached response or run `fetch()` once for all concurrent callers.
+
+        The shared request is only cancelled when every caller waiting on it
+        has been cancelled. `refresh` skips the cache lookup (but still
+        shares a request already in flight).
+        """
+        data = None if refresh else self.cache.get(key)
+        if data is not None:
+            return data
+
+        entry = self._inflight.get(key)
+        if entry is None:
+            task = asyncio.ensure_future(self._fetch_and_store(key, fetch))
+            entry = [task, 0]
+            self._inflight[key] = entry
+
+            def forget(_task, entry=entry):
+                if self._inflight.get(key) is entry:
+                    del self._inflight[key]
+
+            task.add_done_callback(forget)
+
+        entry[1] += 1
+        try:
+            return await asyncio.shield(entry[0])
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and not entry[0].done():
+                entry[0].cancel()
+
+    async def _fetch_and_store(self, key, fetch):
+        data = await fetch()
+        self.cache.set(key, data)
+        if key[0] == "weather" and data.get("id"):
+            self.city_ids[key[1]] = data["id"]
+        self.locations.add("forecast" if key[0] == "forecast" else "weather", data)
+        return data
+
+    def nearest_city(self, lat: float, lon: float, max_km: float = 50.0):
+        """Closest previously fetched city as (name, country), without an API call."""
+        return self.locations.nearest_city(lat, lon, max_km)
+
+    async def get_weather(self, city: str, refresh: bool = False) -> Dict:
         """
         Fetch weather data for a given city.
         
         Args:
             city: Name of the city
+            refresh: Bypass the response cache
             
         Returns:
             Dictionary containing weather data
@@ -47,7 +204,50 @@ class WeatherService:
             raise WeatherServiceError(
                 "Missing OpenWeather API key. Please set OPENWEATHER_API_KEY in a .env file or environment variables."
             )
-        
+
+        return await self._cached(
+            self.weather_key(city), lambda: self._fetch_weather_batched(city), refresh
+        )
+
+    async def _fetch_weather_batched(self, city: str) -> Dict:
+        """Use a group request when batching is on and the city id is known."""
+        city_id = self.city_ids.get(city.strip().lower())
+        if Config.GROUP_BATCHING and city_id is not None:
+            return await self.group_batcher.get(city_id)
+        return await self._fetch_weather(city)
+
+    async def _fetch_group(self, city_ids) -> Dict:
+        """Fetch current weather for up to 20 city ids in one request.
+
+        Returns a dict mapping city id to its payload.
+        """
+        group_url = self.base_url.rsplit("/", 1)[0] + "/group"
+        params = {
+            "id": ",".join(str(city_id) for city_id in city_ids),
+            "appid": self.api_key,
+            "units": Config.UNITS,
+        }
+        await self.rate_limiter.acquire()
+        try:
+            async with self._get_client() as client:
+                response = await client.get(group_url, params=params)
+                if response.status_code != 200:
+                    raise WeatherServiceError(
+                        f"Error fetching weather data: {response.status_code}",
+                        status_code=response.status_code,
+                    )
+                return {item.get("id"): item for item in response.json().get("list", [])}
+        except WeatherServiceError:
+            raise
+        except httpx.TimeoutException:
+            raise WeatherServiceError(
+                "Request timed out. Please check your internet connection."
+            )
+        except Exception as e:
+            raise WeatherServiceError(f"Error fetching weather data: {str(e)}")
+
+    async def _fetch_weather(self, city: str) -> Dict:
+        """Request current weather for `city` from the API (no caching)."""
         # Build request parameters
         params = {
             "q": city,
@@ -55,34 +255,45 @@ class WeatherService:
             "units": Config.UNITS,
         }
         
+        await self.rate_limiter.acquire()
         try:
             # Make async HTTP request
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self._get_client() as client:
                 response = await client.get(self.base_url, params=params)
                 
                 # Check for HTTP errors
                 if response.status_code == 404:
                     raise WeatherServiceError(
-                        f"City '{city}' not found. Please check the spelling."
+                        f"City '{city}' not found. Please check the spelling.",
+                        status_code=404,
                     )
                 elif response.status_code == 401:
                     raise WeatherServiceError(
-                        "Invalid API key. Please check your configuration."
+                        "Invalid API key. Please check your configuration.",
+                        status_code=401,
                     )
                 elif response.status_code >= 500:
                     raise WeatherServiceError(
                         "Weather service is currently unavailable. "
-                        "Please try again later."
+                        "Please try again later.",
+                        status_code=response.status_code,
                     )
                 elif response.status_code != 200:
                     raise WeatherServiceError(
-                        f"Error fetching weather data: {response.status_code}"
+                        f"Error fetching weather data: {response.status_code}",
+                        status_code=response.status_code,
                     )
                 
                 # Parse JSON response
                 data = response.json()
                 return data
                 
+        except asyncio.CancelledError:
+            # The search was superseded; let the caller's task see the cancel
+            raise
+        except WeatherServiceError:
+            # Already has a user-facing message; don't wrap it again below
+            raise
         except httpx.TimeoutException:
             raise WeatherServiceError(
                 "Request timed out. Please check your internet connection."
@@ -96,6 +307,36 @@ class WeatherService:
         except Exception as e:
             raise WeatherServiceError(f"An unexpected error occurred: {str(e)}")
     
+    async def get_weather_many(self, cities: Iterable[str], concurrency: int = 8):
+        """
+        Fetch weather for many cities with bounded concurrency.
+        
+        Args:
+            cities: City names to fetch
+            concurrency: Maximum number of requests in flight
+            
+        Yields:
+            (city, data, error) tuples in completion order; exactly one of
+            data and error is set
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def fetch(city):
+            async with semaphore:
+                try:
+                    return city, await self.get_weather(city), None
+                except WeatherServiceError as e:
+                    return city, None, e
+
+        tasks = [asyncio.ensure_future(fetch(city)) for city in cities]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Caller stopped early (or was cancelled): drop remaining requests
+            for task in tasks:
+                task.cancel()
+
     async def get_weather_by_coordinates(
         self, 
         lat: float, 
@@ -111,6 +352,17 @@ class WeatherService:
         Returns:
             Dictionary containing weather data
         """
+        nearby = self.locations.nearest(
+            "weather", lat, lon, Config.NEARBY_RADIUS_KM, Config.CACHE_TTL
+        )
+        if nearby is not None:
+            return nearby
+        return await self._cached(
+            self.coordinates_key(lat, lon),
+            lambda: self._fetch_weather_by_coordinates(lat, lon),
+        )
+
+    async def _fetch_weather_by_coordinates(self, lat: float, lon: float) -> Dict:
         params = {
             "lat": lat,
             "lon": lon,
@@ -118,8 +370,9 @@ class WeatherService:
             "units": Config.UNITS,
         }
         
+        await self.rate_limiter.acquire()
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self._get_client() as client:
                 response = await client.get(self.base_url, params=params)
                 response.raise_for_status()
                 return response.json()
@@ -132,6 +385,17 @@ class WeatherService:
 
         Returns the JSON response with hourly data.
         """
+        nearby = self.locations.nearest(
+            "forecast", lat, lon, Config.NEARBY_RADIUS_KM, Config.CACHE_TTL
+        )
+        if nearby is not None:
+            return nearby
+        return await self._cached(
+            self.forecast_key(lat, lon),
+            lambda: self._fetch_hourly_forecast(lat, lon),
+        )
+
+    async def _fetch_hourly_forecast(self, lat: float, lon: float) -> Dict:
         onecall_url = "https://api.openweathermap.org/data/2.5/onecall"
         params = {
             "lat": lat,
@@ -140,12 +404,18 @@ class WeatherService:
             "appid": self.api_key,
             "units": Config.UNITS,
         }
+        await self.rate_limiter.acquire()
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self._get_client() as client:
                 response = await client.get(onecall_url, params=params)
                 if response.status_code != 200:
-                    raise WeatherServiceError(f"Error fetching forecast: {response.status_code}")
+                    raise WeatherServiceError(
+                        f"Error fetching forecast: {response.status_code}",
+                        status_code=response.status_code,
+                    )
                 return response.json()
+        except WeatherServiceError:
+            raise
         except httpx.TimeoutException:
             raise WeatherServiceError("Forecast request timed out.")
         except Exception as e:
@@ -154,3 +424,24 @@ class WeatherService:
     async def get_weather_by_coords(self, lat, lon):
         url = f"{self.base_url}?lat={lat}&lon={lon}&appid={self.api_key}&units=metric"
         return await self._make_request(url)
+
+
+_shared_service: Optional[WeatherService] = None
+_shared_service_lock = threading.Lock()
+
+
+def get_shared_service() -> WeatherService:
+    """Return the process-wide WeatherService, creating it on first use.
+
+    When the app is served to many browser sessions, they all share one
+    HTTP connection pool, response cache and rate limiter.
+    """
+    global _shared_service
+    # Sessions start on worker threads, so guard against creating two
+    with _shared_service_lock:
+        if _shared_service is None:
+            service = WeatherService()
+            # Keep one pooled client open for the lifetime of the process
+            service.client = httpx.AsyncClient(timeout=service.timeout)
+            _shared_service = service
+        return _shared_service
@@ -1,3 +1,8 @@
+import os
+import sys
+import warnings
+from pathlib import Path
+
 import flet as ft
 import mysql.connector
 from db_connection import connect_db
@@ -20,7 +25,26 @@ def _check_credentials_sync(username: str, password: str) -> bool:
             conn.close()
 
 
+# FLET_PROFILE=1 times every event handler with tools/handler_profiler.py
+# (for a `flet build` package, copy that file next to this one)
+TOOLS_DIR = Path(__file__).resolve().parent.parent.parent / "tools"
+
+
+def profile_handlers(page: ft.Page):
+    if str(TOOLS_DIR) not in sys.path:
+        sys.path.append(str(TOOLS_DIR))
+    try:
+        from handler_profiler import install_from_env
+    except ImportError:
+        warnings.warn("FLET_PROFILE is set but handler_profiler.py was not found")
+        return
+    install_from_env(page)
+
+
 def main(page: ft.Page):
+    if os.getenv("FLET_PROFILE", "").lower() in ("1", "true", "yes"):
+        profile_handlers(page)
+
     # --- Page setup ---
     page.title = "User Login"
     try:
@@ -89,132 +113,121 @@ def main(page: ft.Page):
 
     status_text = ft.Text("", size=12, color=ft.Colors.RED)
 
+    # Dialogs are built once and reopened on every click, so repeated
+    # logins don't keep adding controls to the page.
+    def close_dialog(d: ft.AlertDialog):
+        d.open = False
+        page.update()
+
+    # Success dialog
+    welcome_text = ft.Text("", size=18, text_align=ft.TextAlign.CENTER)
+    success_dialog = ft.AlertDialog(
+        modal=True,
+        shape=ft.RoundedRectangleBorder(radius=12),
+        title=ft.Row(
+            [
+                ft.Icon(ft.Icons.CHECK_CIRCLE, color=ft.Colors.GREEN, size=30),
+                ft.Text("Login Successful", size=18, weight=ft.FontWeight.BOLD),
+            ],
+        ),
+        content=ft.Container(  # <-- Wrap content in Container
+            content=welcome_text,
+            width=320,
+            padding=20,
+        ),
+        actions_alignment=ft.MainAxisAlignment.END,
+        actions=[ft.TextButton("OK", on_click=lambda ev: close_dialog(success_dialog))],
+    )
+
+    # Failure dialog
+    failure_dialog = ft.AlertDialog(
+        modal=True,
+        shape=ft.RoundedRectangleBorder(radius=12),
+        title=ft.Row(
+            [
+                ft.Icon(ft.Icons.ERROR, color=ft.Colors.RED, size=30),
+                ft.Text("Login Failed", size=18, weight=ft.FontWeight.BOLD),
+            ],
+            alignment=ft.MainAxisAlignment.CENTER,
+        ),
+        content=ft.Container(
+            content=ft.Text("Invalid username or password", size=18, text_align=ft.TextAlign.CENTER),
+            width=320,
+            padding=20,
+        ),
+        actions_alignment=ft.MainAxisAlignment.END,
+        actions=[ft.TextButton("OK", on_click=lambda ev: close_dialog(failure_dialog))],
+    )
+
+    # Input error dialog
+    invalid_input_dialog = ft.AlertDialog(
+        modal=True,
+        shape=ft.RoundedRectangleBorder(radius=12),
+        title=ft.Row(
+            [
+                ft.Icon(ft.Icons.INFO, color=ft.Colors.BLUE, size=30),
+                ft.Text("Input Error", size=18, weight=ft.FontWeight.BOLD),
+            ],
+            alignment=ft.MainAxisAlignment.CENTER,
+        ),
+        content=ft.Container(
+            content=ft.Text("Please enter username and password", size=18, text_align=ft.TextAlign.CENTER),
+            width=320,
+            padding=20,
+        ),
+        actions_alignment=ft.MainAxisAlignment.END,
+        actions=[ft.TextButton("OK", on_click=lambda ev: close_dialog(invalid_input_dialog))],
+    )
+
+    # Database error dialog
+    database_error_dialog = ft.AlertDialog(
+        modal=True,
+        shape=ft.RoundedRectangleBorder(radius=12),
+        title=ft.Row(
+            [
+                ft.Icon(ft.Icons.WARNING, color=ft.Colors.AMBER, size=30),
+                ft.Text("Database Error", size=18, weight=ft.FontWeight.BOLD),
+            ],
+            alignment=ft.MainAxisAlignment.CENTER,
+        ),
+        content=ft.Container(
+            content=ft.Text(
+                "An error occurred while connecting to the database",
+                size=18,
+                text_align=ft.TextAlign.CENTER,
+            ),
+            width=320,
+            padding=20,
+        ),
+        actions_alignment=ft.MainAxisAlignment.END,
+        actions=[ft.TextButton("OK", on_click=lambda ev: close_dialog(database_error_dialog))],
+    )
+
     async def login_click(e):
         uname = username_field.value.strip()
         pwd = password_field.value
 
-        def close_dialog(d: ft.AlertDialog):
-            d.open = False
-            page.update()
-
-        # Success dialog
-        success_dialog = ft.AlertDialog(
-            modal=True,
-            shape=ft.RoundedRectangleBorder(radius=12),
-            title=ft.Row(
-                [
-                    ft.Icon(ft.Icons.CHECK_CIRCLE, color=ft.Colors.GREEN, size=30),
-                    ft.Text("Login Successful", size=18, weight=ft.FontWeight.BOLD),
-                ],
-            ),
-            content=ft.Container(  # <-- Wrap content in Container
-                content=ft.Text(f"Welcome, {uname}!", size=18, text_align=ft.TextAlign.CENTER),
-                width=320,
-                padding=20,
-            ),
-            actions_alignment=ft.MainAxisAlignment.END,
-            actions=[ft.TextButton("OK", on_click=lambda ev: close_dialog(success_dialog))],
-        )
-
-        # Failure dialog
-        failure_dialog = ft.AlertDialog(
-            modal=True,
-            shape=ft.RoundedRectangleBorder(radius=12),
-            title=ft.Row(
-                [
-                    ft.Icon(ft.Icons.ERROR, color=ft.Colors.RED, size=30),
-                    ft.Text("Login Failed", size=18, weight=ft.FontWeight.BOLD),
-                ],
-                alignment=ft.MainAxisAlignment.CENTER,
-            ),
-            content=ft.Container(
-                content=ft.Text("Invalid username or password", size=18, text_align=ft.TextAlign.CENTER),
-                width=320,
-                padding=20,
-            ),
-            actions_alignment=ft.MainAxisAlignment.END,
-            actions=[ft.TextButton("OK", on_click=lambda ev: close_dialog(failure_dialog))],
-        )
-
-        # Input error dialog
-        invalid_input_dialog = ft.AlertDialog(
-            modal=True,
-            shape=ft.RoundedRectangleBorder(radius=12),
-            title=ft.Row(
-                [
-                    ft.Icon(ft.Icons.INFO, color=ft.Colors.BLUE, size=30),
-                    ft.Text("Input Error", size=18, weight=ft.FontWeight.BOLD),
-                ],
-                alignment=ft.MainAxisAlignment.CENTER,
-            ),
-            content=ft.Container(
-                content=ft.Text("Please enter username and password", size=18, text_align=ft.TextAlign.CENTER),
-                width=320,
-                padding=20,
-            ),
-            actions_alignment=ft.MainAxisAlignment.END,
-            actions=[ft.TextButton("OK", on_click=lambda ev: close_dialog(invalid_input_dialog))],
-        )
-
-        # Database error dialog
-        database_error_dialog = ft.AlertDialog(
-            modal=True,
-            shape=ft.RoundedRectangleBorder(radius=12),
-            title=ft.Row(
-                [
-                    ft.Icon(ft.Icons.WARNING, color=ft.Colors.AMBER, size=30),
-                    ft.Text("Database Error", size=18, weight=ft.FontWeight.BOLD),
-                ],
-                alignment=ft.MainAxisAlignment.CENTER,
-            ),
-            content=ft.Container(
-                content=ft.Text(
-                    "An error occurred while connecting to the database",
-                    size=18,
-                    text_align=ft.TextAlign.CENTER,
-                ),
-                width=320,
-                padding=20,
-            ),
-            actions_alignment=ft.MainAxisAlignment.END,
-            actions=[ft.TextButton("OK", on_click=lambda ev: close_dialog(database_error_dialog))],
-        )
-
         # --- Input validation ---
         if not uname or not pwd:
-              page.dialog = invalid_input_dialog
-              page.add(invalid_input_dialog)
-              invalid_input_dialog.open = True
-              page.update()
-              return
+            page.open(invalid_input_dialog)
+            return
 
         try:
             ok = await asyncio.to_thread(_check_credentials_sync, uname, pwd)
             if ok:
-                page.dialog = success_dialog
-                page.add(success_dialog)
-                success_dialog.open = True
+                welcome_text.value = f"Welcome, {uname}!"
                 username_field.value = ""
                 password_field.value = ""
+                page.open(success_dialog)
             else:
-                page.dialog = failure_dialog
-                page.add(failure_dialog)
-                failure_dialog.open = True
-
-            page.update()
+                page.open(failure_dialog)
 
         except mysql.connector.Error as db_err:
-              page.dialog = database_error_dialog
-              page.add(database_error_dialog)
-              database_error_dialog.open = True
-              status_text.value = f"DB error: {db_err}"
-              page.update()
+            status_text.value = f"DB error: {db_err}"
+            page.open(database_error_dialog)
         except Exception as ex:
-              page.dialog = database_error_dialog
-              page.add(database_error_dialog)
-              database_error_dialog.open = True
-              status_text.value = f"Error: {ex}"
-              page.update()
+            status_text.value = f"Error: {ex}"
+            page.open(database_error_dialog)
 
     login_btn = ft.ElevatedButton(
         "Login",
@@ -1,77 +1,28 @@
+import csv
+import time
+
 import flet as ft
-from database import add_contact_db, get_all_contacts_db, update_contact_db, delete_contact_db
+from database import add_contact_db, update_contact_db, delete_contact_db, find_duplicates_db
+from contact_io import export_contacts, import_contacts
+
+# Rejected rows listed in the dialog after an import
+REJECTS_SHOWN = 20
 
 
-def display_contacts(page: ft.Page, contacts_list_view, db_conn, search_text: str = ""):
+def display_contacts(page: ft.Page, contact_list, db_conn, search_text: str = ""):
     """
-    Fetches and displays all contacts in the provided container (ft.Column).
-    Uses ft.Card for each contact and provides Edit/Delete in a PopupMenuButton.
+    Reloads the contact list from the database, filtered by search_text.
+    contact_list is a ContactList, which builds cards only for the rows on
+    screen and fetches further pages as the user scrolls.
     """
-    contacts_list_view.controls.clear()
-    contacts = get_all_contacts_db(db_conn, search_text)
-
-    for contact in contacts:
-        contact_id, name, phone, email = contact
-
-        # Build contact row inside a card
-        contact_row = ft.Row(
-            [
-                ft.Column(
-                    [
-                        ft.Text(name, weight=ft.FontWeight.BOLD, size=14),
-                        ft.Row(
-                            [
-                                ft.Icon(ft.Icons.PHONE, size=16),
-                                ft.Text(phone or "-", size=12),
-                                ft.Container(width=12),  # small spacer
-                                ft.Icon(ft.Icons.EMAIL, size=16),
-                                ft.Text(email or "-", size=12),
-                            ],
-                            tight=True,
-                        ),
-                    ],
-                    spacing=6,
-                    expand=True,
-                ),
-                ft.PopupMenuButton(
-                    icon=ft.Icons.MORE_VERT,
-                    items=[
-                        ft.PopupMenuItem(
-                            text="Edit",
-                            icon=ft.Icons.EDIT,
-                            # FIXED: bind current contact with default arg
-                            on_click=lambda e, c=(contact_id, name, phone, email): open_edit_dialog(
-                                page, c, db_conn, contacts_list_view
-                            ),
-                        ),
-                        ft.PopupMenuItem(
-                            text="Delete",
-                            icon=ft.Icons.DELETE,
-                            # FIXED: bind current contact_id
-                            on_click=lambda e, cid=contact_id: confirm_delete(
-                                page, cid, db_conn, contacts_list_view
-                            ),
-                        ),
-                    ],
-                ),
-            ],
-            alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
-            vertical_alignment=ft.CrossAxisAlignment.CENTER,
-        )
-
-        card = ft.Card(
-            content=ft.Container(content=contact_row, padding=12),
-            elevation=2,
-            margin=ft.margin.only(bottom=8),
-        )
-        contacts_list_view.controls.append(card)
-
+    contact_list.load(search_text)
     page.update()
 
 
-def add_contact(page: ft.Page, inputs, contacts_list_view, db_conn):
+def add_contact(page: ft.Page, inputs, contact_list, db_conn):
     """
-    Adds a new contact after validation and refreshes the list.
+    Adds a new contact after validation and inserts its card into the list.
+    If a contact with the same phone or email exists, asks first.
     inputs: tuple(name_input, phone_input, email_input)
     """
     name_input, phone_input, email_input = inputs
@@ -100,25 +51,51 @@ def add_contact(page: ft.Page, inputs, contacts_list_view, db_conn):
     else:
         email_input.error_text = None
 
-    # Save new contact
-    add_contact_db(
-        db_conn,
-        name_input.value.strip(),
-        phone_input.value.strip(),
-        email_input.value.strip(),
-    )
+    contact = (name_input.value.strip(), phone_input.value.strip(), email_input.value.strip())
+    duplicates = find_duplicates_db(db_conn, contact[1], contact[2])
+    if duplicates:
+        confirm_duplicate(page, duplicates, lambda: save_contact(page, inputs, contact, contact_list, db_conn))
+        return
+    save_contact(page, inputs, contact, contact_list, db_conn)
+
 
-    # Clear fields
+def save_contact(page: ft.Page, inputs, contact, contact_list, db_conn):
+    """Saves a validated (name, phone, email) and clears the form."""
+    name_input, phone_input, email_input = inputs
+    contact_id = add_contact_db(db_conn, *contact)
+    contact_list.insert((contact_id, *contact))
+
+    # Clear fields (sent together with the new card)
     name_input.value = ""
     phone_input.value = ""
     email_input.value = ""
     page.update()
 
-    # Always refresh full list
-    display_contacts(page, contacts_list_view, db_conn)
 
+def confirm_duplicate(page, duplicates, on_confirm):
+    """Shows the existing contacts that share the phone or email; saves only if the user says so."""
+    existing = [
+        ft.Text(f"{name} · {phone or '-'} · {email or '-'}", size=12)
+        for _contact_id, name, phone, email in duplicates[:5]
+    ]
+
+    def add_anyway(e):
+        dialog.open = False  # sent with the new card
+        on_confirm()
 
-def open_edit_dialog(page, contact, db_conn, contacts_list_view):
+    dialog = ft.AlertDialog(
+        modal=True,
+        title=ft.Text("Possible Duplicate"),
+        content=ft.Column([ft.Text("A contact with this phone or email already exists:")] + existing, tight=True),
+        actions=[
+            ft.TextButton("Cancel", on_click=lambda e: close_dialog(page, dialog)),
+            ft.TextButton("Add Anyway", on_click=add_anyway),
+        ],
+    )
+    page.open(dialog)
+
+
+def open_edit_dialog(page, contact, db_conn, contact_list):
     """Opens a dialog to edit a contact's details."""
     contact_id, name, phone, email = contact
 
@@ -128,9 +105,9 @@ def open_edit_dialog(page, contact, db_conn, contacts_list_view):
 
     def save_and_close(e):
         update_contact_db(db_conn, contact_id, edit_name.value, edit_phone.value, edit_email.value)
+        contact_list.update_contact((contact_id, edit_name.value, edit_phone.value, edit_email.value))
         dialog.open = False
         page.update()
-        display_contacts(page, contacts_list_view, db_conn)
 
     dialog = ft.AlertDialog(
         modal=True,
@@ -148,14 +125,14 @@ def open_edit_dialog(page, contact, db_conn, contacts_list_view):
 
     page.open(dialog)
 
-def delete_contact(page: ft.Page, contact_id, db_conn, contacts_list_view):
+def delete_contact(page: ft.Page, contact_id, db_conn, contact_list):
     """
     Opens a confirmation dialog before deletion. Only deletes if user confirms.
     """
     delete_contact_db(db_conn, contact_id)
-    display_contacts(page, contacts_list_view, db_conn)
+    contact_list.remove(contact_id)  # sent by close_dialog's page.update()
 
-def confirm_delete(page, contact_id, db_conn, contacts_list_view):
+def confirm_delete(page, contact_id, db_conn, contact_list):
     dialog = ft.AlertDialog(
         modal=True,
         title=ft.Text("Confirm Delete"),
@@ -165,7 +142,7 @@ def confirm_delete(page, contact_id, db_conn, contacts_list_view):
             ft.TextButton(
                 "Yes",
                 on_click=lambda e: (
-                    delete_contact(page, contact_id, db_conn, contacts_list_view),
+                    delete_contact(page, contact_id, db_conn, contact_list),
                     close_dialog(page, dialog)
                 ),
             ),
@@ -176,4 +153,65 @@ def confirm_delete(page, contact_id, db_conn, contacts_list_view):
     
 def close_dialog(page, dialog):
     dialog.open = False
-    page.update()
\ No newline at end of file
+    page.update()
+
+
+def import_file(page: ft.Page, path, contact_list, db_conn, status_text):
+    """
+    Imports contacts from a .csv or .vcf file.
+    Progress goes to status_text (at most twice a second); the list is
+    reloaded once, after the whole file is in.
+    """
+    if not path:
+        status_text.value = "Import needs a file on this device (not available in the browser)."
+        page.update()
+        return
+
+    last_shown = [0.0]
+
+    def progress(imported, rejected):
+        now = time.monotonic()
+        if now - last_shown[0] >= 0.5:
+            last_shown[0] = now
+            status_text.value = f"Importing... {imported} added, {rejected} skipped"
+            page.update()
+
+    try:
+        result = import_contacts(db_conn, path, progress)
+    except (OSError, ValueError, UnicodeDecodeError, csv.Error) as ex:
+        status_text.value = f"Import failed: {ex}"
+        page.update()
+        return
+
+    status_text.value = f"Imported {result.imported} contacts"
+    if result.rejected:
+        status_text.value += f", skipped {len(result.rejected)}"
+        show_rejected(page, result.rejected)
+    display_contacts(page, contact_list, db_conn, contact_list.search_text)
+
+
+def show_rejected(page, rejected):
+    """Lists the rows an import skipped, with their line numbers."""
+    lines = [ft.Text(f"Line {line}: {reason}", size=12) for line, reason, _raw in rejected[:REJECTS_SHOWN]]
+    if len(rejected) > REJECTS_SHOWN:
+        lines.append(ft.Text(f"...and {len(rejected) - REJECTS_SHOWN} more", size=12, italic=True))
+    dialog = ft.AlertDialog(
+        modal=True,
+        title=ft.Text("Skipped Rows"),
+        content=ft.Container(content=ft.Column(lines, scroll=ft.ScrollMode.AUTO), height=240, width=300),
+        actions=[ft.TextButton("OK", on_click=lambda e: close_dialog(page, dialog))],
+    )
+    page.open(dialog)
+
+
+def export_file(page: ft.Page, path, db_conn, status_text):
+    """Writes every contact to a .csv or .vcf file."""
+    if not path:
+        return
+    try:
+        count = export_contacts(db_conn, path)
+    except (OSError, ValueError) as ex:
+        status_text.value = f"Export failed: {ex}"
+    else:
+        status_text.value = f"Exported {count} contacts"
+    page.update()
@@ -0,0 +1,286 @@
+import argparse
+import csv
+import itertools
+import os
+import re
+import sys
+
+from database import init_db
+
+# Rows inserted per transaction during import
+IMPORT_CHUNK = 1000
+
+# Header names accepted for each column (compared lower-cased)
+CSV_COLUMNS = {
+    "name": ("name", "full name", "fn", "display name"),
+    "phone": ("phone", "phone number", "mobile", "tel", "telephone"),
+    "email": ("email", "e-mail", "email address", "e-mail address", "mail"),
+}
+
+# Rows read ahead to decide whether an unrecognised first row is a header
+HEADER_SAMPLE = 50
+
+# A cell that holds a phone number: digits and phone separators only
+_PHONE_LIKE = re.compile(r"[\d\s\-().+/]*\d[\d\s\-().+/]*")
+
+
+class ImportResult:
+    """What an import did: counts plus the rows that were skipped and why."""
+
+    def __init__(self):
+        self.imported = 0
+        self.rejected = []  # (line number, reason, raw text)
+
+    def __repr__(self):
+        return f"ImportResult(imported={self.imported}, rejected={len(self.rejected)})"
+
+
+def file_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".vcf", ".vcard"):
+        return "vcard"
+    if extension == ".csv":
+        return "csv"
+    raise ValueError(f"Unsupported file type: {extension or path} (use .csv or .vcf)")
+
+
+# ------------------------- Reading -------------------------
+def read_csv(file, has_header=None, skipped=None):
+    """
+    Yields (line, name, phone, email, raw) for each non-empty row. Columns
+    are found by header name; without a recognised header the first three
+    columns are name, phone, email.
+
+    has_header=None guesses whether an unrecognised first row is a header
+    (see looks_like_header); True or False says so. A guessed header is
+    not imported but appended to skipped as (line, reason, raw), so the
+    import reports it.
+    """
+    reader = csv.reader(file)
+    rows = ((reader.line_num, row) for row in reader)
+    first = next(rows, None)
+    if first is None:
+        return
+    first_line, header = first
+    lowered = [cell.strip().lower() for cell in header]
+    positions = {}
+    for column, aliases in CSV_COLUMNS.items():
+        positions[column] = next((i for i, cell in enumerate(lowered) if cell in aliases), None)
+
+    if positions["name"] is None:
+        positions = {"name": 0, "phone": 1, "email": 2}
+        sample = list(itertools.islice(rows, HEADER_SAMPLE))
+        rows = _chain(sample, rows)
+        if has_header is None and looks_like_header(header, [row for _line, row in sample]):
+            if skipped is not None:
+                skipped.append((first_line, "header row not recognised, columns read as name, phone, email", ",".join(header)))
+        elif not has_header:
+            rows = _chain([first], rows)  # no header: the first row is data
+
+    for line, row in rows:
+        if not any(cell.strip() for cell in row):
+            continue
+        values = {}
+        for column, index in positions.items():
+            values[column] = row[index].strip() if index is not None and index < len(row) else ""
+        yield line, values["name"], values["phone"], values["email"], ",".join(row)
+
+
+def looks_like_header(first, sample) -> bool:
+    """
+    True if the first row has a plain-text cell where the rows below it
+    hold phone numbers or email addresses, e.g. "Mobile" above "0917 555 1234".
+    """
+    for i, cell in enumerate(first):
+        cell = cell.strip()
+        if not cell or _looks_like_value(cell):
+            continue
+        values = [row[i].strip() for row in sample if i < len(row) and row[i].strip()]
+        if values and cell not in values and all(_looks_like_value(value) for value in values):
+            return True
+    return False
+
+
+def _looks_like_value(cell: str) -> bool:
+    return "@" in cell or _PHONE_LIKE.fullmatch(cell) is not None
+
+
+def read_vcard(file):
+    """
+    Yields (line, name, phone, email, raw) for each card in a vCard file.
+    Uses FN (or N when FN is missing), the first TEL and the first EMAIL.
+    """
+    card = None
+    start = 0
+    for line_number, line in _unfold(file):
+        name, _, value = line.partition(":")
+        key = name.split(";")[0].upper()
+        if key == "BEGIN" and value.strip().upper() == "VCARD":
+            card = {}
+            start = line_number
+        elif card is None:
+            continue
+        elif key == "END":
+            full_name = card.get("FN") or " ".join(part for part in reversed(card.get("N", "").split(";")[:2]) if part)
+            yield start, full_name.strip(), card.get("TEL", ""), card.get("EMAIL", ""), card.get("FN", "")
+            card = None
+        elif key in ("FN", "N", "TEL", "EMAIL") and key not in card:
+            card[key] = _unescape(value.strip())
+
+
+def _unfold(file):
+    """Joins vCard continuation lines (starting with a space or tab)."""
+    pending, pending_line = None, 0
+    for line_number, line in enumerate(file, 1):
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and pending is not None:
+            pending += line[1:]
+            continue
+        if pending is not None:
+            yield pending_line, pending
+        pending, pending_line = line, line_number
+    if pending is not None:
+        yield pending_line, pending
+
+
+def _unescape(value: str) -> str:
+    return value.replace("\\n", " ").replace("\\N", " ").replace("\\,", ",").replace("\\;", ";").replace("\\\\", "\\")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace(",", "\\,").replace(";", "\\;").replace("\n", "\\n")
+
+
+def _chain(first, rest):
+    yield from first
+    yield from rest
+
+
+def validate(name, phone, email):
+    """Returns why a contact cannot be imported, or None if it can."""
+    if not name:
+        return "missing name"
+    if not (phone or email):
+        return "missing phone and email"
+    if email and "@" not in email:
+        return f"invalid email {email!r}"
+    return None
+
+
+# ------------------------- Import -------------------------
+def import_contacts(db, path: str, progress=None, chunk_size: int = IMPORT_CHUNK, has_header=None) -> ImportResult:
+    """
+    Streams contacts from a .csv or .vcf file into the database.
+    Rows are inserted with executemany, one transaction per chunk, and the
+    file is never loaded whole. progress(imported, rejected) is called after
+    every chunk. has_header is passed to read_csv.
+    """
+    result = ImportResult()
+    if file_format(path) == "vcard":
+        read = read_vcard
+    else:
+        def read(file):
+            return read_csv(file, has_header, result.rejected)
+    chunk = []
+
+    def insert_chunk():
+        with db.writer() as conn:
+            conn.executemany("INSERT INTO contacts (name, phone, email) VALUES (?, ?, ?)", chunk)
+        result.imported += len(chunk)
+        chunk.clear()
+        if progress is not None:
+            progress(result.imported, len(result.rejected))
+
+    with open(path, encoding="utf-8-sig", newline="") as file:
+        for line, name, phone, email, raw in read(file):
+            reason = validate(name, phone, email)
+            if reason is not None:
+                result.rejected.append((line, reason, raw))
+                continue
+            chunk.append((name, phone or None, email or None))
+            if len(chunk) >= chunk_size:
+                insert_chunk()
+    if chunk:
+        insert_chunk()
+    elif progress is not None:
+        progress(result.imported, len(result.rejected))
+    return result
+
+
+# ------------------------- Export -------------------------
+def export_contacts(db, path: str, progress=None, every: int = IMPORT_CHUNK) -> int:
+    """
+    Writes every contact to a .csv or .vcf file, in list order.
+    Rows are streamed from one cursor, so memory use does not grow with the
+    number of contacts. Returns the number of contacts written.
+    """
+    vcard = file_format(path) == "vcard"
+    count = 0
+    with db.reader() as conn, open(path, "w", encoding="utf-8", newline="") as file:
+        cursor = conn.execute("SELECT name, phone, email FROM contacts ORDER BY name COLLATE NOCASE, id")
+        writer = None if vcard else csv.writer(file)
+        if writer is not None:
+            writer.writerow(["name", "phone", "email"])
+        for name, phone, email in cursor:
+            if writer is not None:
+                writer.writerow([name, phone or "", email or ""])
+            else:
+                file.write(vcard_entry(name, phone, email))
+            count += 1
+            if progress is not None and count % every == 0:
+                progress(count)
+    if progress is not None:
+        progress(count)
+    return count
+
+
+def vcard_entry(name, phone, email) -> str:
+    lines = ["BEGIN:VCARD", "VERSION:3.0", f"FN:{_escape(name)}", f"N:;{_escape(name)};;;"]
+    if phone:
+        lines.append(f"TEL;TYPE=CELL:{_escape(phone)}")
+    if email:
+        lines.append(f"EMAIL;TYPE=INTERNET:{_escape(email)}")
+    lines.append("END:VCARD")
+    return "".join(_fold(line) + "\r\n" for line in lines)
+
+
+def _fold(line: str, width: int = 75) -> str:
+    """Splits lines longer than the vCard limit into continuation lines."""
+    if len(line) <= width:
+        return line
+    parts = [line[:width]]
+    line = line[width:]
+    while line:
+        parts.append(" " + line[: width - 1])
+        line = line[width - 1:]
+    return "\r\n".join(parts)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Import or export contact book contacts (.csv or .vcf).")
+    parser.add_argument("action", choices=["import", "export"])
+    parser.add_argument("file")
+    parser.add_argument("--header", action=argparse.BooleanOptionalAction, default=None,
+                        help="the .csv file does (or does not) start with a header row (default: guess)")
+    args = parser.parse_args(argv)
+
+    db = init_db()
+    try:
+        if args.action == "import":
+            result = import_contacts(
+                db, args.file, progress=lambda done, bad: print(f"\r{done} imported, {bad} rejected", end="", file=sys.stderr),
+                has_header=args.header,
+            )
+            print(file=sys.stderr)
+            for line, reason, raw in result.rejected:
+                print(f"line {line}: {reason}: {raw}")
+            return 1 if result.rejected else 0
+        count = export_contacts(db, args.file)
+        print(f"{count} contacts written to {args.file}", file=sys.stderr)
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
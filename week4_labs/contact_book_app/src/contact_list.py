@@ -0,0 +1,373 @@
+import asyncio
+import itertools
+import math
+import threading
+
+import flet as ft
+from database import PAGE_SIZE, contact_matches_db, get_contacts_page, page_key, search_contacts_page, sort_key
+
+# Every card has the same height, so a scroll offset maps straight to a row
+CARD_HEIGHT = 72
+ROW_HEIGHT = CARD_HEIGHT + 8  # card plus its bottom margin
+
+# Cards built above and below the visible rows
+BUFFER_ROWS = 10
+
+# Viewport height assumed until the first scroll event reports the real one
+DEFAULT_VIEWPORT = 600
+
+# Seconds to wait after the last keystroke before searching
+SEARCH_DELAY = 0.2
+
+
+class ContactCard:
+    """A contact card that can be re-bound to another contact instead of rebuilt."""
+
+    def __init__(self, on_edit, on_delete):
+        self.contact = None
+        self.name_text = ft.Text(weight=ft.FontWeight.BOLD, size=14)
+        self.phone_text = ft.Text(size=12)
+        self.email_text = ft.Text(size=12)
+
+        contact_row = ft.Row(
+            [
+                ft.Column(
+                    [
+                        self.name_text,
+                        ft.Row(
+                            [
+                                ft.Icon(ft.Icons.PHONE, size=16),
+                                self.phone_text,
+                                ft.Container(width=12),  # small spacer
+                                ft.Icon(ft.Icons.EMAIL, size=16),
+                                self.email_text,
+                            ],
+                            tight=True,
+                        ),
+                    ],
+                    spacing=6,
+                    expand=True,
+                ),
+                ft.PopupMenuButton(
+                    icon=ft.Icons.MORE_VERT,
+                    items=[
+                        # read self.contact when clicked, so a recycled card acts on its current contact
+                        ft.PopupMenuItem(text="Edit", icon=ft.Icons.EDIT, on_click=lambda e: on_edit(self.contact)),
+                        ft.PopupMenuItem(text="Delete", icon=ft.Icons.DELETE, on_click=lambda e: on_delete(self.contact[0])),
+                    ],
+                ),
+            ],
+            alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
+            vertical_alignment=ft.CrossAxisAlignment.CENTER,
+        )
+
+        self.control = ft.Card(
+            content=ft.Container(content=contact_row, padding=12, height=CARD_HEIGHT),
+            elevation=2,
+            margin=ft.margin.only(bottom=8),
+        )
+
+    def bind(self, contact):
+        """Shows another contact; only texts that differ are sent on the next update."""
+        if contact == self.contact:
+            return
+        self.contact = contact
+        _contact_id, name, phone, email = contact
+        self.name_text.value = name
+        self.phone_text.value = phone or "-"
+        self.email_text.value = email or "-"
+
+
+class ContactList:
+    """
+    Virtualized contact list.
+    Keeps the contacts loaded so far in `rows`, but builds cards only for the
+    rows around the viewport. Spacers stand in for the rows above and below,
+    so the scrollbar still matches the list. More pages are fetched from the
+    database as the user scrolls toward the end of what is loaded, for
+    search results as well as for the whole list.
+
+    insert(), update_contact() and remove() apply a single change without
+    reloading: they touch one card and the spacer heights.
+
+    Sync handlers run on Flet's thread pool while searches finish on the
+    event loop, so every method that changes the list holds one lock.
+    Searches apply their results from a worker thread, so the loop never
+    waits for it.
+    """
+
+    def __init__(self, page: ft.Page, db_conn, on_edit, on_delete):
+        self.page = page
+        self.db_conn = db_conn
+        self.on_edit = on_edit
+        self.on_delete = on_delete
+
+        self.search_text = ""
+        self.rows = []  # contacts loaded so far, in display order
+        self.exhausted = False  # True once every matching contact is in rows
+        self.fetched = 0  # search results read so far (the offset of the next page)
+        self.loaded_ids = set()  # ids in rows while searching, to skip repeats
+        self.first = 0  # index in rows of the first card
+        self.cards = []  # ContactCards for rows[first:first + len(cards)]
+        self.cards_by_id = {}  # contact id -> its card, for the cards in self.cards
+        self.pool = []  # cards scrolled out of view, kept for reuse
+        self.pixels = 0.0
+        self.viewport = DEFAULT_VIEWPORT
+        self.generation = 0  # bumped by every load/search; older results are dropped
+        self._generations = itertools.count(1)  # next() is atomic, unlike += across threads
+        self._lock = threading.RLock()
+        self._search_task = None
+
+        self.top_spacer = ft.Container(height=0)
+        self.bottom_spacer = ft.Container(height=0)
+        self.view = ft.ListView(
+            [self.top_spacer, self.bottom_spacer],
+            expand=1,
+            spacing=0,
+            on_scroll=self.on_scroll,
+            on_scroll_interval=50,
+        )
+
+    # ------------------------- Loading -------------------------
+    def load(self, search_text: str = ""):
+        """Replaces the list with the first page of contacts matching search_text."""
+        with self._lock:
+            self.generation = next(self._generations)
+            self._show(search_text, *self._query(search_text))
+
+    def search(self, search_text: str):
+        """
+        Debounced search for an async on_change handler.
+        The query runs on a worker thread SEARCH_DELAY after the last call;
+        a newer keystroke cancels the pending search, and results that come
+        back after another load or search are thrown away.
+        """
+        if self._search_task is not None:
+            self._search_task.cancel()
+        self.generation = next(self._generations)
+        self._search_task = asyncio.ensure_future(self._run_search(search_text, self.generation))
+
+    async def _run_search(self, search_text: str, generation: int):
+        await asyncio.sleep(SEARCH_DELAY)
+        rows, exhausted = await asyncio.to_thread(self._query, search_text)
+        await asyncio.to_thread(self._apply_search, search_text, rows, exhausted, generation)
+
+    def _apply_search(self, search_text: str, rows, exhausted: bool, generation: int):
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._show(search_text, rows, exhausted)
+            self.page.update()
+
+    def _query(self, search_text: str):
+        """Reads what the first screen needs; safe to run off the event loop."""
+        limit = self._window_size() + PAGE_SIZE
+        if search_text:
+            rows = search_contacts_page(self.db_conn, search_text, limit=limit)
+        else:
+            rows = get_contacts_page(self.db_conn, limit=limit)
+        return rows, len(rows) < limit
+
+    def _show(self, search_text: str, rows, exhausted: bool):
+        self.search_text = search_text or ""
+        self.rows = rows
+        self.exhausted = exhausted
+        self.fetched = len(rows)
+        self.loaded_ids = {row[0] for row in rows} if self.search_text else set()
+        scrolled = self.pixels > 0
+        self.pixels = 0.0
+        self.first = 0
+        self._render()
+        if scrolled:
+            try:
+                self.page.update()
+                self.view.scroll_to(offset=0, duration=0)
+            except Exception:
+                pass
+
+    def _load_until(self, count: int):
+        """Fetches pages until `count` rows are loaded or the table runs out."""
+        while len(self.rows) < count and not self.exhausted:
+            if self.search_text:
+                page = search_contacts_page(self.db_conn, self.search_text, offset=self.fetched)
+                self.fetched += len(page)
+                new_rows = [row for row in page if row[0] not in self.loaded_ids]
+                self.loaded_ids.update(row[0] for row in new_rows)
+                self.rows.extend(new_rows)
+            else:
+                after = page_key(self.rows[-1]) if self.rows else None
+                page = get_contacts_page(self.db_conn, after)
+                self.rows.extend(page)
+            self.exhausted = len(page) < PAGE_SIZE
+
+    # ------------------------- Windowing -------------------------
+    def _window_size(self) -> int:
+        return math.ceil(self.viewport / ROW_HEIGHT) + 2 * BUFFER_ROWS
+
+    def _render(self):
+        """Binds cards to rows[first:first + window] and sizes the spacers."""
+        size = self._window_size()
+        # keep a page of rows beyond the window loaded, so the scrollbar has room to move
+        self._load_until(self.first + size + PAGE_SIZE)
+        if self.first >= len(self.rows):
+            self.first = max(0, len(self.rows) - size)
+        window = self.rows[self.first:self.first + size]
+
+        # free the cards leaving the window first, so the new rows can reuse them
+        window_ids = {contact[0] for contact in window}
+        old_cards = self.cards_by_id
+        self.pool.extend(card for contact_id, card in old_cards.items() if contact_id not in window_ids)
+        cards = []
+        for contact in window:
+            card = old_cards.get(contact[0]) or self._take_card()
+            card.bind(contact)
+            cards.append(card)
+        self.cards = cards
+        self.cards_by_id = {card.contact[0]: card for card in cards}
+
+        self.view.controls = [self.top_spacer] + [card.control for card in cards] + [self.bottom_spacer]
+        self._size_spacers()
+
+    def _size_spacers(self):
+        self.top_spacer.height = self.first * ROW_HEIGHT
+        self.bottom_spacer.height = (len(self.rows) - self.first - len(self.cards)) * ROW_HEIGHT
+
+    def _take_card(self) -> ContactCard:
+        if self.pool:
+            return self.pool.pop()
+        return ContactCard(self.on_edit, self.on_delete)
+
+    def on_scroll(self, e):
+        """Moves the window once the visible rows come close to its edge."""
+        with self._lock:
+            self.pixels = e.pixels
+            if e.viewport_dimension:
+                self.viewport = e.viewport_dimension
+            top_row = int(self.pixels // ROW_HEIGHT)
+            bottom_row = top_row + math.ceil(self.viewport / ROW_HEIGHT)
+            last = self.first + len(self.cards)
+
+            near_top = self.first > 0 and top_row < self.first + BUFFER_ROWS // 2
+            near_bottom = bottom_row > last - BUFFER_ROWS // 2 and (last < len(self.rows) or not self.exhausted)
+            if near_top or near_bottom:
+                self.first = max(0, top_row - BUFFER_ROWS)
+                self._render()
+                self.page.update()
+
+    # ------------------------- Single changes -------------------------
+    def insert(self, contact):
+        """Adds a new contact at its place in the list (if it belongs in the list at all)."""
+        with self._lock:
+            if self.search_text:
+                if not contact_matches_db(self.db_conn, contact[0], self.search_text):
+                    return
+                position = len(self.rows)  # below the ranked results
+                self.loaded_ids.add(contact[0])  # a later page may rank it again
+            else:
+                position = self._position(contact)
+                if position == len(self.rows) and not self.exhausted:
+                    return  # arrives with a later page
+            self._insert_at(position, contact)
+
+    def update_contact(self, contact):
+        """Shows an edited contact, moving its card only if its place changed."""
+        with self._lock:
+            index = self._index_of(contact[0])
+            if index is None:
+                return
+            if self.search_text:
+                if not contact_matches_db(self.db_conn, contact[0], self.search_text):
+                    self._remove_at(index)
+                    return
+                # its rank may have moved past the next page's offset; reading
+                # a row early only repeats one, and repeats are skipped
+                self.fetched = max(0, self.fetched - 1)
+            else:
+                key = sort_key(contact)
+                before = self.rows[index - 1] if index > 0 else None
+                after = self.rows[index + 1] if index + 1 < len(self.rows) else None
+                # past the last loaded row, unloaded contacts may now come first
+                beyond_loaded = after is None and not self.exhausted and key > sort_key(self.rows[index])
+                if (
+                    (before is not None and sort_key(before) > key)
+                    or (after is not None and sort_key(after) < key)
+                    or beyond_loaded
+                ):
+                    self._remove_at(index)
+                    self.insert(contact)
+                    return
+            self.rows[index] = contact
+            card = self.cards_by_id.get(contact[0])
+            if card is not None:
+                card.bind(contact)
+
+    def remove(self, contact_id):
+        """Drops a deleted contact's card (or just shrinks a spacer if it is off screen)."""
+        with self._lock:
+            index = self._index_of(contact_id)
+            if index is not None:
+                self._remove_at(index)
+
+    def _position(self, contact) -> int:
+        """Index in rows where contact sorts (binary search on the list order)."""
+        key = sort_key(contact)
+        low, high = 0, len(self.rows)
+        while low < high:
+            middle = (low + high) // 2
+            if sort_key(self.rows[middle]) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _index_of(self, contact_id):
+        card = self.cards_by_id.get(contact_id)
+        if card is not None:
+            return self.first + self.cards.index(card)
+        for index, row in enumerate(self.rows):
+            if row[0] == contact_id:
+                return index
+        return None
+
+    def _insert_at(self, position: int, contact):
+        self.rows.insert(position, contact)
+        last = self.first + len(self.cards)
+        if position < self.first:
+            self.first += 1
+        elif position <= last and (position < last or len(self.cards) < self._window_size()):
+            card = self._take_card()
+            card.bind(contact)
+            offset = position - self.first
+            self.cards.insert(offset, card)
+            self.cards_by_id[contact[0]] = card
+            self.view.controls.insert(1 + offset, card.control)
+            if len(self.cards) > self._window_size():
+                self._drop_card(len(self.cards) - 1)
+        self._size_spacers()
+
+    def _remove_at(self, index: int):
+        contact = self.rows.pop(index)
+        if self.search_text:
+            # one result fewer before the next page's offset
+            self.loaded_ids.discard(contact[0])
+            self.fetched = max(0, self.fetched - 1)
+        if index < self.first:
+            self.first -= 1
+        elif index < self.first + len(self.cards):
+            self._drop_card(index - self.first)
+            # pull the next row up into the window
+            self._load_until(self.first + self._window_size() + 1)
+            next_index = self.first + len(self.cards)
+            if next_index < len(self.rows):
+                card = self._take_card()
+                card.bind(self.rows[next_index])
+                self.cards.append(card)
+                self.cards_by_id[card.contact[0]] = card
+                self.view.controls.insert(len(self.view.controls) - 1, card.control)
+        self._size_spacers()
+
+    def _drop_card(self, offset: int):
+        card = self.cards.pop(offset)
+        self.cards_by_id.pop(card.contact[0], None)
+        self.view.controls.remove(card.control)
+        self.pool.append(card)
@@ -1,66 +1,646 @@
+import atexit
 import sqlite3
 import os
+import queue
+import re
+import string
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
 
 DB_FILENAME = os.path.join(os.path.dirname(__file__), "contacts.db")
 
+# Bumped whenever a migration is added to MIGRATIONS (stored in PRAGMA user_version)
+SCHEMA_VERSION = 4
 
-def init_db():
-    """Initializes the database and creates the contacts table if it doesn't exist."""
-    conn = sqlite3.connect(DB_FILENAME, check_same_thread=False)
-    cursor = conn.cursor()
-    cursor.execute(
+# Contacts per page for get_contacts_page / iter_contacts
+PAGE_SIZE = 50
+
+# Search ranking weights for bm25(): name, phone, email
+SEARCH_WEIGHTS = (10.0, 2.0, 1.0)
+
+# Word characters as the FTS5 unicode61 tokenizer sees them (underscore separates)
+_SEARCH_TOKEN = re.compile(r"[^\W_]+")
+
+# A search made of digits and phone separators only, e.g. "0917 55"
+_PHONE_FRAGMENT = re.compile(r"[\d\s\-().+/]+")
+
+# Digits needed before a search is treated as part of a phone number
+# (the trigram index cannot look up fewer than three characters)
+PHONE_SEARCH_MIN_DIGITS = 3
+
+_NOCASE = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+# Phone normalization (E.164-style digits, no "+"): separators are removed,
+# "00" starts an international number and a single leading "0" is a local
+# number in DEFAULT_COUNTRY_CODE. Changing either needs a new migration,
+# because the phone_norm column is computed by SQLite from the same rules.
+PHONE_SEPARATORS = " -().+/"
+DEFAULT_COUNTRY_CODE = "63"
+
+# Read connections kept open for queries from worker threads
+READERS = 4
+
+# Group commit: writes queued while the previous batch commits, plus any
+# arriving within BATCH_WINDOW seconds, share one transaction (at most
+# BATCH_MAX_OPS). With WAL and synchronous=NORMAL a commit does not fsync,
+# so waiting longer costs a lone writer more than it saves; raise the window
+# if synchronous is set to FULL.
+BATCH_WINDOW = 0.0
+BATCH_MAX_OPS = 256
+
+# Applied to every connection. WAL lets readers run while a write commits;
+# synchronous=NORMAL syncs the WAL at checkpoints instead of every commit.
+PRAGMAS = [
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA mmap_size = 268435456",  # 256 MB
+    "PRAGMA cache_size = -16000",  # 16 MB
+    "PRAGMA temp_store = MEMORY",
+]
+
+
+def _create_search_index(conn):
+    """Version 1: FTS5 index over name, phone and email, kept in sync by triggers."""
+    statements = [
         """
-        CREATE TABLE IF NOT EXISTS contacts (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            phone TEXT,
-            email TEXT
+        CREATE VIRTUAL TABLE IF NOT EXISTS contacts_fts USING fts5(
+            name, phone, email,
+            content='contacts',
+            content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='1 2 3'
         )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS contacts_fts_insert AFTER INSERT ON contacts BEGIN
+            INSERT INTO contacts_fts(rowid, name, phone, email)
+            VALUES (new.id, new.name, new.phone, new.email);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS contacts_fts_delete AFTER DELETE ON contacts BEGIN
+            INSERT INTO contacts_fts(contacts_fts, rowid, name, phone, email)
+            VALUES ('delete', old.id, old.name, old.phone, old.email);
+        END
+        """,
         """
+        CREATE TRIGGER IF NOT EXISTS contacts_fts_update AFTER UPDATE ON contacts BEGIN
+            INSERT INTO contacts_fts(contacts_fts, rowid, name, phone, email)
+            VALUES ('delete', old.id, old.name, old.phone, old.email);
+            INSERT INTO contacts_fts(rowid, name, phone, email)
+            VALUES (new.id, new.name, new.phone, new.email);
+        END
+        """,
+        # backfill contacts added before the index existed
+        "INSERT INTO contacts_fts(contacts_fts) VALUES ('rebuild')",
+    ]
+    for statement in statements:
+        conn.execute(statement)
+
+
+def _create_name_index(conn):
+    """Version 2: index matching the list order, for keyset pagination."""
+    conn.execute("CREATE INDEX IF NOT EXISTS contacts_name_key ON contacts(name COLLATE NOCASE, id)")
+
+
+def _phone_digits_sql(column: str) -> str:
+    """SQL expression for column with PHONE_SEPARATORS removed."""
+    digits = column
+    for separator in PHONE_SEPARATORS:
+        digits = f"replace({digits}, '{separator}', '')"
+    return digits
+
+
+def _phone_norm_sql(column: str) -> str:
+    """SQL expression equal to normalize_phone(column)."""
+    digits = _phone_digits_sql(column)
+    return (
+        f"CASE WHEN {digits} LIKE '00%' THEN substr({digits}, 3) "
+        f"WHEN {digits} LIKE '0%' THEN '{DEFAULT_COUNTRY_CODE}' || substr({digits}, 2) "
+        f"ELSE {digits} END"
     )
-    conn.commit()
-    return conn
 
 
-def add_contact_db(conn, name, phone, email):
-    """Adds a new contact to the database."""
-    cursor = conn.cursor()
-    cursor.execute(
+def _add_normalized_columns(conn):
+    """Version 3: indexed, normalized phone and email for duplicate detection."""
+    conn.execute(f"ALTER TABLE contacts ADD COLUMN phone_norm TEXT GENERATED ALWAYS AS ({_phone_norm_sql('phone')}) VIRTUAL")
+    conn.execute("ALTER TABLE contacts ADD COLUMN email_norm TEXT GENERATED ALWAYS AS (lower(trim(email))) VIRTUAL")
+    conn.execute("CREATE INDEX IF NOT EXISTS contacts_phone_norm ON contacts(phone_norm)")
+    conn.execute("CREATE INDEX IF NOT EXISTS contacts_email_norm ON contacts(email_norm)")
+
+
+def _phone_search_sql(column: str) -> str:
+    """SQL expression for the text indexed in contacts_phone."""
+    return f"{_phone_digits_sql(column)} || ' ' || {_phone_norm_sql(column)}"
+
+
+def _create_phone_index(conn):
+    """
+    Version 4: trigram index for searching any part of a phone number.
+    Each phone is indexed as typed (digits only) and normalized, so both
+    "0917 55" and "+63 917 55" find 0917-551-2345. The table stores no
+    copy of the text (content=''), only the trigrams.
+    """
+    statements = [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS contacts_phone USING fts5(digits, content='', tokenize='trigram')",
+        f"""
+        CREATE TRIGGER IF NOT EXISTS contacts_phone_insert AFTER INSERT ON contacts
+        WHEN new.phone IS NOT NULL BEGIN
+            INSERT INTO contacts_phone(rowid, digits) VALUES (new.id, {_phone_search_sql('new.phone')});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS contacts_phone_delete AFTER DELETE ON contacts
+        WHEN old.phone IS NOT NULL BEGIN
+            INSERT INTO contacts_phone(contacts_phone, rowid, digits) VALUES ('delete', old.id, {_phone_search_sql('old.phone')});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS contacts_phone_update AFTER UPDATE OF phone ON contacts BEGIN
+            INSERT INTO contacts_phone(contacts_phone, rowid, digits)
+            SELECT 'delete', old.id, {_phone_search_sql('old.phone')} WHERE old.phone IS NOT NULL;
+            INSERT INTO contacts_phone(rowid, digits)
+            SELECT new.id, {_phone_search_sql('new.phone')} WHERE new.phone IS NOT NULL;
+        END
+        """,
+        # backfill the existing contacts
+        f"INSERT INTO contacts_phone(rowid, digits) SELECT id, {_phone_search_sql('contacts.phone')} FROM contacts WHERE phone IS NOT NULL",
+    ]
+    for statement in statements:
+        conn.execute(statement)
+
+
+# MIGRATIONS[i] upgrades a database from user_version i to i + 1
+MIGRATIONS = [_create_search_index, _create_name_index, _add_normalized_columns, _create_phone_index]
+
+
+def migrate(conn):
+    """Applies the migrations a database has not had yet, one transaction each."""
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for target in range(version + 1, SCHEMA_VERSION + 1):
+        conn.execute("BEGIN")
+        try:
+            MIGRATIONS[target - 1](conn)
+            conn.execute(f"PRAGMA user_version = {target}")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+
+class Database:
+    """
+    Connection manager for contacts.db.
+    Writes go through one connection, one at a time (SQLite allows a single
+    writer anyway). Reads borrow a connection from a small pool, so searches
+    on worker threads never share a connection with a write in progress.
+
+    Single writes are queued with write() and committed in groups by a
+    background thread, so a burst of N writes costs one commit, not N.
+    """
+
+    def __init__(self, filename=None, readers: int = READERS, batch_window: float = BATCH_WINDOW,
+                 batch_max_ops: int = BATCH_MAX_OPS):
+        self.filename = filename or DB_FILENAME
+        self.batch_window = batch_window
+        self.batch_max_ops = batch_max_ops
+        self._write_lock = threading.Lock()
+        self._writer = self._connect()
+        self._readers = queue.LifoQueue()
+        self._reader_slots = threading.Semaphore(readers)
+        self._pending_writes = queue.Queue()
+        self._batch_thread = None
+        self._batch_thread_lock = threading.Lock()
+        self._closed = False
+
+        self._writer.execute(
+            """
+            CREATE TABLE IF NOT EXISTS contacts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                phone TEXT,
+                email TEXT
+            )
+            """
+        )
+        self._writer.commit()
+        migrate(self._writer)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.filename, check_same_thread=False, timeout=10, cached_statements=256)
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    @contextmanager
+    def reader(self):
+        """Borrows a read connection; blocks while all of them are in use."""
+        self._reader_slots.acquire()
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+            self._reader_slots.release()
+
+    @contextmanager
+    def writer(self):
+        """Holds the write connection; commits on success, rolls back on error."""
+        with self._write_lock:
+            try:
+                yield self._writer
+                self._writer.commit()
+            except Exception:
+                self._writer.rollback()
+                raise
+
+    def write(self, operation, *args) -> Future:
+        """
+        Queues operation(conn, *args) for the next group commit.
+        The returned Future gets the operation's return value (or exception)
+        once its batch has been committed. A failing operation is rolled
+        back on its own; the rest of its batch still commits. After close()
+        the Future already holds sqlite3.ProgrammingError.
+        """
+        future = Future()
+        # Checked and queued under the lock close() takes, so nothing is
+        # queued behind the batch thread's stop marker
+        with self._batch_thread_lock:
+            if self._closed:
+                future.set_exception(sqlite3.ProgrammingError("Cannot operate on a closed database."))
+                return future
+            if self._batch_thread is None:
+                self._batch_thread = threading.Thread(target=self._run_batches, name="contacts-db-writer", daemon=True)
+                self._batch_thread.start()
+            self._pending_writes.put((operation, args, future))
+        return future
+
+    def flush(self, timeout=None):
+        """Blocks until every write queued so far has been committed."""
+        if self._closed:
+            return  # close() already committed them
+        self.write(_no_op).result(timeout)
+
+    def _run_batches(self):
+        stopping = False
+        while not stopping:
+            item = self._pending_writes.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.batch_window
+            while len(batch) < self.batch_max_ops:
+                try:
+                    item = self._pending_writes.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._commit_batch(batch)
+
+    def _commit_batch(self, batch):
+        outcomes = []
+        with self._write_lock:
+            conn = self._writer
+            try:
+                conn.execute("BEGIN")
+                for operation, args, future in batch:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    conn.execute("SAVEPOINT write_op")
+                    try:
+                        result = operation(conn, *args)
+                    except Exception as exc:
+                        conn.execute("ROLLBACK TO write_op")
+                        conn.execute("RELEASE write_op")
+                        outcomes.append((future, None, exc))
+                    else:
+                        conn.execute("RELEASE write_op")
+                        outcomes.append((future, result, None))
+                conn.execute("COMMIT")
+            except Exception as exc:
+                conn.rollback()
+                for _operation, _args, future in batch:
+                    if future.done():
+                        continue
+                    if future.running() or future.set_running_or_notify_cancel():
+                        future.set_exception(exc)
+                return
+        # resolve only after COMMIT, so callers never see uncommitted writes
+        for future, result, exc in outcomes:
+            if exc is not None:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+    def close(self):
+        """Commits the queued writes and closes every connection. Safe to call twice."""
+        with self._batch_thread_lock:
+            if self._closed:
+                return
+            self._closed = True
+        if self._batch_thread is not None:
+            self._pending_writes.put(None)
+            self._batch_thread.join()
+        with self._write_lock:
+            self._writer.execute("PRAGMA optimize")
+            self._writer.close()
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+def _no_op(conn):
+    return None
+
+
+def init_db():
+    """Opens the database, creating the contacts table and indexes if needed."""
+    return Database(DB_FILENAME)
+
+
+_shared_db = None
+_shared_db_users = 0
+_shared_db_lock = threading.Lock()
+
+
+def get_shared_db():
+    """
+    Returns the process-wide Database, opening it on first use.
+    Every page session shares it, so there is one writer thread and one
+    set of connections however many browser tabs are open. Call
+    release_shared_db() when the session ends.
+    """
+    global _shared_db, _shared_db_users
+    # Sessions start on worker threads, so guard against opening two
+    with _shared_db_lock:
+        if _shared_db is None:
+            _shared_db = init_db()
+        _shared_db_users += 1
+        return _shared_db
+
+
+def release_shared_db():
+    """Closes the shared Database once the last session using it has ended."""
+    global _shared_db, _shared_db_users
+    with _shared_db_lock:
+        if _shared_db is None:
+            return
+        _shared_db_users -= 1
+        if _shared_db_users > 0:
+            return
+        db, _shared_db, _shared_db_users = _shared_db, None, 0
+    db.close()
+
+
+@atexit.register
+def _close_shared_db():
+    # Commits writes still queued when the app exits
+    global _shared_db
+    with _shared_db_lock:
+        db, _shared_db = _shared_db, None
+    if db is not None:
+        db.close()
+
+
+def _insert_contact(conn, name, phone, email):
+    cursor = conn.execute(
         "INSERT INTO contacts (name, phone, email) VALUES (?, ?, ?)",
         (name, phone, email),
     )
-    conn.commit()
+    return cursor.lastrowid
+
+
+def add_contact_db(db, name, phone, email):
+    """Adds a new contact to the database and returns its id once committed."""
+    return db.write(_insert_contact, name, phone, email).result()
+
+
+def normalize_phone(phone):
+    """Python version of the phone_norm column."""
+    if not phone:
+        return phone
+    digits = phone
+    for separator in PHONE_SEPARATORS:
+        digits = digits.replace(separator, "")
+    if digits.startswith("00"):
+        return digits[2:]
+    if digits.startswith("0"):
+        return DEFAULT_COUNTRY_CODE + digits[1:]
+    return digits
+
 
+def normalize_email(email):
+    """Python version of the email_norm column."""
+    if not email:
+        return email
+    return email.strip().lower()
 
-def get_all_contacts_db(conn, search_term: str = None):
+
+def find_duplicates_db(db, phone, email):
     """
-    Retrieves all contacts from the database.
-    If search_term is provided, performs a case-insensitive search on the name field.
+    Returns contacts with the same normalized phone or email (two index lookups).
+    Empty values never match.
     """
-    cursor = conn.cursor()
-    if search_term:
-        like_term = f"%{search_term}%"
-        cursor.execute(
-            "SELECT id, name, phone, email FROM contacts WHERE name LIKE ? ORDER BY name COLLATE NOCASE",
-            (like_term,),
-        )
+    phone_norm = normalize_phone(phone) or None
+    email_norm = normalize_email(email) or None
+    if phone_norm is None and email_norm is None:
+        return []
+    with db.reader() as conn:
+        return conn.execute(
+            """
+            SELECT id, name, phone, email FROM contacts WHERE phone_norm = ?
+            UNION
+            SELECT id, name, phone, email FROM contacts WHERE email_norm = ?
+            """,
+            (phone_norm, email_norm),
+        ).fetchall()
+
+
+def search_query(search_term: str) -> str:
+    """
+    Turns what the user typed into an FTS5 MATCH expression.
+    Every word must match the start of a word in name, phone or email, so
+    "jua del" finds "Juan Dela Cruz". Words are quoted, so FTS5 operators
+    typed by the user are searched for literally.
+    """
+    words = _SEARCH_TOKEN.findall(search_term or "")
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def phone_search_query(search_term: str):
+    """
+    Returns a contacts_phone MATCH expression if search_term looks like part
+    of a phone number ("0917 55", "+63 917"), otherwise None.
+    The digits are looked up as typed and normalized like phone_norm, so
+    "0917 55" also finds a phone saved as "+63 917 555 1234".
+    """
+    if not search_term or not _PHONE_FRAGMENT.fullmatch(search_term.strip()):
+        return None
+    digits = re.sub(r"\D", "", search_term)
+    if len(digits) < PHONE_SEARCH_MIN_DIGITS:
+        return None
+    normalized = normalize_phone(digits)
+    if normalized == digits or len(normalized) < PHONE_SEARCH_MIN_DIGITS:
+        return f'"{digits}"'
+    return f'"{digits}" OR "{normalized}"'
+
+
+def contact_matches_db(db, contact_id, search_term: str) -> bool:
+    """Returns True if the contact is among the results for search_term."""
+    phone_query = phone_search_query(search_term)
+    if phone_query is not None:
+        sql, query = "SELECT 1 FROM contacts_phone WHERE contacts_phone MATCH ? AND rowid = ?", phone_query
     else:
-        cursor.execute("SELECT id, name, phone, email FROM contacts ORDER BY name COLLATE NOCASE")
-    return cursor.fetchall()
+        sql, query = "SELECT 1 FROM contacts_fts WHERE contacts_fts MATCH ? AND rowid = ?", search_query(search_term)
+    if not query:
+        return False
+    with db.reader() as conn:
+        row = conn.execute(sql, (query, contact_id)).fetchone()
+    return row is not None
+
+
+def get_all_contacts_db(db, search_term: str = None):
+    """
+    Retrieves all contacts from the database, or every result for
+    search_term (see search_contacts_page). Prefer the paged functions
+    for anything shown on screen.
+    """
+    if not search_term:
+        return list(iter_contacts(db))
+    return search_contacts_page(db, search_term, limit=-1)
+
+
+def search_contacts_page(db, search_term: str, offset: int = 0, limit: int = PAGE_SIZE):
+    """
+    Returns up to `limit` results for search_term, skipping the first `offset`.
+    Performs a full-text prefix search on name, phone and email, best
+    matches (bm25, name weighted highest) first. A search of three or more
+    digits (spaces, dashes and the like allowed) instead finds those digits
+    anywhere in the phone number, through the trigram index, in list order.
+
+    SQLite still scores every match to rank them, but only one page of
+    rows is joined and returned. Offsets are used instead of a keyset:
+    bm25 is computed per query, so a (rank, id) key would not let the
+    next page skip any of that work either.
+    """
+    phone_query = phone_search_query(search_term)
+    if phone_query is not None:
+        with db.reader() as conn:
+            return conn.execute(
+                """
+                SELECT c.id, c.name, c.phone, c.email
+                FROM contacts_phone
+                JOIN contacts AS c ON c.id = contacts_phone.rowid
+                WHERE contacts_phone MATCH ?
+                ORDER BY c.name COLLATE NOCASE, c.id
+                LIMIT ? OFFSET ?
+                """,
+                (phone_query, limit, offset),
+            ).fetchall()
+
+    query = search_query(search_term)
+    if not query:
+        return []
+    with db.reader() as conn:
+        return conn.execute(
+            """
+            SELECT c.id, c.name, c.phone, c.email
+            FROM contacts_fts
+            JOIN contacts AS c ON c.id = contacts_fts.rowid
+            WHERE contacts_fts MATCH ?
+            ORDER BY bm25(contacts_fts, ?, ?, ?), c.name COLLATE NOCASE, c.id
+            LIMIT ? OFFSET ?
+            """,
+            (query, *SEARCH_WEIGHTS, limit, offset),
+        ).fetchall()
+
+
+def get_contacts_page(db, after=None, limit: int = PAGE_SIZE):
+    """
+    Returns up to `limit` contacts in list order (name, case-insensitive, then id).
+    Pass the `page_key()` of the last contact of the previous page as `after`
+    to get the next page. Each page is an index seek, so it costs the same
+    no matter how far into the list it is.
+    """
+    with db.reader() as conn:
+        if after is None:
+            return conn.execute(
+                "SELECT id, name, phone, email FROM contacts ORDER BY name COLLATE NOCASE, id LIMIT ?",
+                (limit,),
+            ).fetchall()
+        name, contact_id = after
+        # Written out instead of (name, id) > (?, ?) so SQLite seeks the index
+        return conn.execute(
+            """
+            SELECT id, name, phone, email FROM contacts
+            WHERE name COLLATE NOCASE >= ? AND (name COLLATE NOCASE > ? OR id > ?)
+            ORDER BY name COLLATE NOCASE, id
+            LIMIT ?
+            """,
+            (name, name, contact_id, limit),
+        ).fetchall()
+
+
+def name_key(name: str) -> str:
+    """Folds a name the way COLLATE NOCASE does (ASCII letters only)."""
+    return name.translate(_NOCASE)
 
 
-def update_contact_db(conn, contact_id, name, phone, email):
-    """Updates an existing contact in the database."""
-    cursor = conn.cursor()
-    cursor.execute(
+def sort_key(contact):
+    """Python equivalent of the list order, ORDER BY name COLLATE NOCASE, id."""
+    return (name_key(contact[1]), contact[0])
+
+
+def page_key(contact):
+    """
+    Returns the (name, id) position of a contact row, for `after=`.
+    The raw name is enough: the query compares it with COLLATE NOCASE.
+    """
+    contact_id, name = contact[0], contact[1]
+    return (name, contact_id)
+
+
+def iter_contacts(db, page_size: int = PAGE_SIZE * 10):
+    """
+    Yields every contact in list order, one page at a time.
+    No read transaction stays open between pages, so the caller may write
+    to the database while iterating.
+    """
+    after = None
+    while True:
+        rows = get_contacts_page(db, after, page_size)
+        yield from rows
+        if len(rows) < page_size:
+            return
+        after = page_key(rows[-1])
+
+
+def _update_contact(conn, contact_id, name, phone, email):
+    conn.execute(
         "UPDATE contacts SET name = ?, phone = ?, email = ? WHERE id = ?",
         (name, phone, email, contact_id),
     )
-    conn.commit()
 
 
-def delete_contact_db(conn, contact_id):
-    """Deletes a contact from the database."""
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM contacts WHERE id = ?", (contact_id,))
-    conn.commit()
\ No newline at end of file
+def _delete_contact(conn, contact_id):
+    conn.execute("DELETE FROM contacts WHERE id = ?", (contact_id,))
+
+
+def update_contact_db(db, contact_id, name, phone, email):
+    """Updates an existing contact in the database (returns once committed)."""
+    db.write(_update_contact, contact_id, name, phone, email).result()
+
+
+def delete_contact_db(db, contact_id):
+    """Deletes a contact from the database (returns once committed)."""
+    db.write(_delete_contact, contact_id).result()
\ No newline at end of file
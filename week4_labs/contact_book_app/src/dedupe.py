@@ -0,0 +1,220 @@
+import argparse
+import difflib
+import re
+import sys
+
+from database import init_db, name_key, normalize_email, normalize_phone
+
+# Names at least this similar (0..1, difflib ratio) count as the same person
+NAME_SIMILARITY = 0.8
+
+# Blocks bigger than this are skipped: a phone or email shared by that many
+# contacts is an office switchboard or a placeholder, not one person
+MAX_BLOCK = 50
+
+# Clusters merged per write transaction
+MERGE_CHUNK = 500
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+# ------------------------- Blocking -------------------------
+def phone_email_blocks(conn):
+    """
+    Yields lists of (id, name, phone_norm, email_norm) that share a
+    normalized phone or email. The GROUP BY reads only the index.
+    """
+    for column in ("phone_norm", "email_norm"):
+        groups = conn.execute(
+            f"""
+            SELECT {column} FROM contacts
+            WHERE {column} <> ''
+            GROUP BY {column}
+            HAVING count(*) BETWEEN 2 AND ?
+            """,
+            (MAX_BLOCK,),
+        ).fetchall()
+        for (value,) in groups:
+            yield conn.execute(
+                f"SELECT id, name, phone_norm, email_norm FROM contacts WHERE {column} = ?",
+                (value,),
+            ).fetchall()
+
+
+def name_blocks(conn):
+    """
+    Yields lists of contacts whose names are equal ignoring case.
+    Walks the name index once, so equal names arrive next to each other.
+    """
+    block, key = [], None
+    cursor = conn.execute("SELECT id, name, phone_norm, email_norm FROM contacts ORDER BY name COLLATE NOCASE, id")
+    for row in cursor:
+        row_key = name_key(row[1])
+        if row_key != key:
+            if 1 < len(block) <= MAX_BLOCK:
+                yield block
+            block, key = [], row_key
+        block.append(row)
+    if 1 < len(block) <= MAX_BLOCK:
+        yield block
+
+
+# ------------------------- Matching -------------------------
+def name_similarity(a: str, b: str) -> float:
+    """Similarity of two names, ignoring case, punctuation and word order."""
+    a = " ".join(sorted(_WORD.findall(a.casefold())))
+    b = " ".join(sorted(_WORD.findall(b.casefold())))
+    if a == b:
+        return 1.0
+    return difflib.SequenceMatcher(None, a, b).ratio()
+
+
+def conflicts(a, b) -> bool:
+    """True if both contacts have a phone (or an email) and they differ."""
+    return any(x and y and x != y for x, y in ((a[2], b[2]), (a[3], b[3])))
+
+
+def similar_names(a, b) -> bool:
+    """Match rule for a phone or email block: the names must be close."""
+    return name_similarity(a[1], b[1]) >= NAME_SIMILARITY
+
+
+def no_conflict(a, b) -> bool:
+    """Match rule for a name block: equal names, so no phone or email may disagree."""
+    return not conflicts(a, b)
+
+
+class UnionFind:
+    """
+    Clusters of contact ids. Each cluster remembers its members' phones and
+    emails, and union() refuses to join clusters whose phones (or emails)
+    disagree: otherwise a contact without a phone could link two people
+    with different numbers into one cluster.
+    """
+
+    def __init__(self):
+        self.parent = {}
+        self.values = {}  # root -> (set of phone_norm, set of email_norm)
+
+    def add(self, row):
+        """Adds an (id, name, phone_norm, email_norm) row as its own cluster."""
+        if row[0] not in self.parent:
+            self.parent[row[0]] = row[0]
+            self.values[row[0]] = ({row[2]} - {None, ""}, {row[3]} - {None, ""})
+
+    def find(self, item):
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]  # path halving
+            item = parent[item]
+        return item
+
+    def union(self, a, b) -> bool:
+        """Joins the clusters of a and b; False if their phones or emails disagree."""
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return True
+        phones_a, emails_a = self.values[root_a]
+        phones_b, emails_b = self.values[root_b]
+        phones, emails = phones_a | phones_b, emails_a | emails_b
+        if len(phones) > 1 or len(emails) > 1:
+            return False
+        root, child = min(root_a, root_b), max(root_a, root_b)
+        self.parent[child] = root
+        self.values[root] = (phones, emails)
+        del self.values[child]
+        return True
+
+    def groups(self):
+        groups = {}
+        for item in self.parent:
+            groups.setdefault(self.find(item), []).append(item)
+        return [sorted(group) for group in groups.values() if len(group) > 1]
+
+
+def find_clusters(db):
+    """
+    Returns lists of contact ids that look like the same person.
+    Only contacts in the same block (same phone, same email or same name)
+    are compared, so the work grows with the number of duplicates, not
+    with the square of the number of contacts.
+    """
+    clusters = UnionFind()
+    with db.reader() as conn:
+        for blocks, matches in ((phone_email_blocks(conn), similar_names), (name_blocks(conn), no_conflict)):
+            for block in blocks:
+                for row in block:
+                    clusters.add(row)
+                for i, a in enumerate(block):
+                    for b in block[i + 1:]:
+                        if matches(a, b):
+                            clusters.union(a[0], b[0])
+    return sorted(clusters.groups())
+
+
+# ------------------------- Merging -------------------------
+def merge_cluster(conn, ids):
+    """
+    Keeps the most complete contact of a cluster (lowest id on a tie),
+    fills its missing phone or email from the others and deletes them.
+    A contact whose phone or email differs from the kept one is left alone,
+    so merging never loses a number or address.
+    Returns the number of contacts deleted.
+    """
+    placeholders = ", ".join("?" * len(ids))
+    rows = conn.execute(f"SELECT id, name, phone, email FROM contacts WHERE id IN ({placeholders})", ids).fetchall()
+    if len(rows) < 2:
+        return 0  # changed since the clusters were found
+    rows.sort(key=lambda row: (-sum(1 for value in row[1:] if value), row[0]))
+    keep_id, _name, phone, email = rows[0]
+    delete = []
+    for row_id, _name, row_phone, row_email in rows[1:]:
+        if conflicts((None, None, normalize_phone(phone), normalize_email(email)),
+                     (None, None, normalize_phone(row_phone), normalize_email(row_email))):
+            continue  # changed since the clusters were found
+        phone, email = phone or row_phone, email or row_email
+        delete.append((row_id,))
+    if not delete:
+        return 0
+    conn.execute("UPDATE contacts SET phone = ?, email = ? WHERE id = ?", (phone, email, keep_id))
+    conn.executemany("DELETE FROM contacts WHERE id = ?", delete)
+    return len(delete)
+
+
+def merge_clusters(db, clusters, chunk_size: int = MERGE_CHUNK) -> int:
+    """Merges clusters, chunk_size per transaction. Returns the number of contacts removed."""
+    removed = 0
+    for start in range(0, len(clusters), chunk_size):
+        with db.writer() as conn:
+            for ids in clusters[start:start + chunk_size]:
+                removed += merge_cluster(conn, ids)
+    return removed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Find (and optionally merge) duplicate contacts.")
+    parser.add_argument("--merge", action="store_true", help="merge the duplicates instead of only listing them")
+    args = parser.parse_args(argv)
+
+    db = init_db()
+    try:
+        clusters = find_clusters(db)
+        if not args.merge:
+            with db.reader() as conn:
+                for ids in clusters:
+                    placeholders = ", ".join("?" * len(ids))
+                    rows = conn.execute(
+                        f"SELECT id, name, phone, email FROM contacts WHERE id IN ({placeholders})", ids
+                    ).fetchall()
+                    print(" | ".join(f"{row[0]}: {row[1]}, {row[2] or '-'}, {row[3] or '-'}" for row in rows))
+            print(f"{len(clusters)} groups of duplicates (run with --merge to merge them)", file=sys.stderr)
+            return 0
+        removed = merge_clusters(db, clusters)
+        print(f"{len(clusters)} groups merged, {removed} contacts removed", file=sys.stderr)
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,51 @@
+import os
+import sys
+import warnings
+from pathlib import Path
+
 import flet as ft
-from database import init_db
-from app_logic import display_contacts, add_contact
+from database import get_shared_db, release_shared_db
+from app_logic import display_contacts, add_contact, open_edit_dialog, confirm_delete, import_file, export_file
+from contact_list import ContactList
+
+# FLET_PROFILE=1 times every event handler with tools/handler_profiler.py
+# (for a `flet build` package, copy that file next to this one)
+TOOLS_DIR = Path(__file__).resolve().parent.parent.parent.parent / "tools"
+
+
+def profile_handlers(page: ft.Page):
+    if str(TOOLS_DIR) not in sys.path:
+        sys.path.append(str(TOOLS_DIR))
+    try:
+        from handler_profiler import install_from_env
+    except ImportError:
+        warnings.warn("FLET_PROFILE is set but handler_profiler.py was not found")
+        return
+    install_from_env(page)
+
 
 def main(page: ft.Page):
+    if os.getenv("FLET_PROFILE", "").lower() in ("1", "true", "yes"):
+        profile_handlers(page)
+
     page.title = "Contact Book"
     page.vertical_alignment = ft.MainAxisAlignment.START
     page.window_width = 420
     page.window_height = 700
     page.padding = 16
 
-    # Initialize DB
-    db_conn = init_db()
+    # One Database for the whole process, shared by every session
+    db_conn = get_shared_db()
+
+    def on_disconnect(e):
+        # Commit this session's queued writes; a web client may still reconnect
+        db_conn.flush()
+
+    def on_close(e):
+        release_shared_db()
+
+    page.on_disconnect = on_disconnect
+    page.on_close = on_close
 
     # Top row: Title + Theme toggle
     title = ft.Text("Contact Book", size=22, weight=ft.FontWeight.BOLD)
@@ -34,20 +69,44 @@ def main(page: ft.Page):
     inputs = (name_input, phone_input, email_input)
 
     # Search field
-    search_input = ft.TextField(label="Search by name", hint_text="Type to filter contacts", width=360)
-
-    # Contacts list
-    contacts_list_view = ft.ListView(expand=1, spacing=10, auto_scroll=True )
+    search_input = ft.TextField(label="Search contacts", hint_text="Name, phone or email", width=360)
+
+    # Contacts list (cards are built only for the rows on screen)
+    contact_list = ContactList(
+        page,
+        db_conn,
+        on_edit=lambda contact: open_edit_dialog(page, contact, db_conn, contact_list),
+        on_delete=lambda contact_id: confirm_delete(page, contact_id, db_conn, contact_list),
+    )
 
     # Add button
-    add_button = ft.ElevatedButton("Add Contact", on_click=lambda e: add_contact(page, inputs, contacts_list_view, db_conn))
+    add_button = ft.ElevatedButton("Add Contact", on_click=lambda e: add_contact(page, inputs, contact_list, db_conn))
+
+    # Import / export (.csv or .vcf)
+    status_text = ft.Text("", size=12)
+    file_picker = ft.FilePicker()
+    page.overlay.append(file_picker)
+
+    def on_file_picked(e):
+        if e.files:
+            import_file(page, e.files[0].path, contact_list, db_conn, status_text)
+        elif e.path:
+            export_file(page, e.path, db_conn, status_text)
+
+    file_picker.on_result = on_file_picked
+    import_button = ft.TextButton(
+        "Import", icon=ft.Icons.UPLOAD_FILE, on_click=lambda e: file_picker.pick_files(allowed_extensions=["csv", "vcf"])
+    )
+    export_button = ft.TextButton(
+        "Export", icon=ft.Icons.DOWNLOAD, on_click=lambda e: file_picker.save_file(file_name="contacts.csv", allowed_extensions=["csv", "vcf"])
+    )
 
     # Clear search button (optional)
-    clear_search_btn = ft.IconButton(ft.Icons.CLEAR, tooltip="Clear search", on_click=lambda e: clear_search(page, search_input, contacts_list_view, db_conn))
+    clear_search_btn = ft.IconButton(ft.Icons.CLEAR, tooltip="Clear search", on_click=lambda e: clear_search(page, search_input, contact_list, db_conn))
 
-    # Search on change: refresh displayed list
-    def on_search_change(e):
-        display_contacts(page, contacts_list_view, db_conn, search_input.value)
+    # Search on change: debounced, queried off the UI thread
+    async def on_search_change(e):
+        contact_list.search(search_input.value)
 
     search_input.on_change = on_search_change
 
@@ -58,13 +117,14 @@ def main(page: ft.Page):
             name_input,
             phone_input,
             email_input,
-            ft.Row([add_button]),
+            ft.Row([add_button, import_button, export_button]),
+            status_text,
             ft.Divider(),
             ft.Row([ft.Text("Contacts:", size=16, weight=ft.FontWeight.BOLD), ft.Container(expand=True), clear_search_btn]),
             ft.Row([search_input]),
             ft.Container(height=8),
             ft.Container(
-                content=ft.Column([contacts_list_view]),
+                content=ft.Column([contact_list.view]),
                 expand=True,
                 padding=0,
             ),
@@ -75,12 +135,11 @@ def main(page: ft.Page):
     page.add(top_row, ft.Divider(), form)
 
     # Initial display
-    display_contacts(page, contacts_list_view, db_conn)
+    display_contacts(page, contact_list, db_conn)
 
-def clear_search(page: ft.Page, search_input: ft.TextField, contacts_container: ft.Column, db_conn):
+def clear_search(page: ft.Page, search_input: ft.TextField, contact_list, db_conn):
     search_input.value = ""
-    page.update()
-    display_contacts(page, contacts_container, db_conn)
+    display_contacts(page, contact_list, db_conn)
 
 if __name__ == "__main__":
     ft.app(target=main)
\ No newline at end of file
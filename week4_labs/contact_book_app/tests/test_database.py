@@ -0,0 +1,44 @@
+import sqlite3
+
+import pytest
+
+from database import Database, add_contact_db, delete_contact_db, search_contacts_page, update_contact_db
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / "contacts.db"))
+    yield db
+    db.close()
+
+
+def names(rows):
+    return sorted(row[1] for row in rows)
+
+
+@pytest.mark.parametrize("search", ["0917 55", "0917-555", "+63 917 55", "63917555", "0063 917 555", "555 12"])
+def test_phone_search_matches_any_saved_format(db, search):
+    add_contact_db(db, "Local", "0917 555 1234", None)
+    add_contact_db(db, "International", "+63 917 555 1234", None)
+    add_contact_db(db, "Dashed", "(0917) 555-1234", None)
+    add_contact_db(db, "Other", "0918 222 3333", None)
+
+    assert names(search_contacts_page(db, search)) == ["Dashed", "International", "Local"]
+
+
+def test_write_after_close_fails_instead_of_hanging(tmp_path):
+    db = Database(str(tmp_path / "contacts.db"))
+    contact_id = add_contact_db(db, "Ana", "0917 555 1234", None)
+    db.close()
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        db.write(lambda conn: None).result(timeout=1)
+    for write in (
+        lambda: add_contact_db(db, "Ben", "0917 555 9999", None),
+        lambda: update_contact_db(db, contact_id, "Ana B", "0917 555 1234", None),
+        lambda: delete_contact_db(db, contact_id),
+    ):
+        with pytest.raises(sqlite3.ProgrammingError):
+            write()
+    db.flush()
+    db.close()